@@ -17,23 +17,43 @@ Auscultation sites (anterior):
     • Tricuspid         – 4th ICS, left sternal border
     • Mitral            – 5th ICS, left MCL
 
+Usage:     python hand_lung_tracker.py [--hand-every N] [--no-opencl]
 Controls:  q = quit   r = reset   m = toggle mode (lung / cardiac)
 
 Dependencies:
     pip install opencv-python mediapipe numpy
+    pip install numba        # optional – JIT-compiles the per-frame geometry
 """
 
+import argparse
 import cv2
 import numpy as np
+import functools
 import math
 import time
 import os
+import sys
+import threading
 import urllib.request
 
 import mediapipe as mp
 from mediapipe.tasks import python as mp_python
 from mediapipe.tasks.python import vision
 
+from sprites import (bake_bgra, blit_bgra, rings_sprite, rounded_rect,
+                     rounded_rect_sprite)
+from tracker_common import (HAND_SEG_IDX, SKEL_JOINT_IDX, SKEL_SEG_IDX,
+                            align_targets, landmarks_to_px, pick_delegate)
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional – fall back to plain Python with identical results
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
 # ─── Paths ────────────────────────────────────────────────────────────────────
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -42,6 +62,12 @@ HAND_MODEL  = os.path.join(SCRIPT_DIR, "hand_landmarker.task")
 POSE_URL = "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_lite/float16/latest/pose_landmarker_lite.task"
 HAND_URL = "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/latest/hand_landmarker.task"
 
+# Frames are drawn on at camera resolution, but the landmarkers only get a
+# downscaled copy – the models resize to ~256 px internally anyway, and
+# landmarks come back normalised so they map straight onto the full frame.
+CAM_W, CAM_H = 1280, 720
+INFER_W      = 640            # height follows the camera's aspect ratio
+
 # ─── Design Tokens ────────────────────────────────────────────────────────────
 
 # Palette – dark medical-monitor aesthetic
@@ -66,6 +92,7 @@ CARD_ACTIVE  = (130, 220, 255)   # amber glow
 CARD_VISITED = (90, 160, 180)
 
 ALIGNMENT_RADIUS = 50
+ALIGNMENT_R2     = ALIGNMENT_RADIUS * ALIGNMENT_RADIUS   # compare without sqrt
 POINT_R          = 10
 
 # ─── Utilities ────────────────────────────────────────────────────────────────
@@ -77,109 +104,114 @@ def ensure_model(path, url):
         print("[INFO] Done.")
 
 
-def px(lm, w, h):
-    return int(lm.x * w), int(lm.y * h)
-
+def configure_opencl(enabled=True):
+    """Turn OpenCV's transparent API (OpenCL) on when a device is present."""
+    use_ocl = enabled and cv2.ocl.haveOpenCL()
+    cv2.ocl.setUseOpenCL(use_ocl)
+    if use_ocl:
+        print(f"[INFO] OpenCL enabled on {cv2.ocl.Device.getDefault().name()}")
+    else:
+        print("[INFO] OpenCL unavailable or disabled – using CPU path")
+    return use_ocl
 
-def dist(a, b):
-    return math.hypot(a[0] - b[0], a[1] - b[1])
 
+# One full period of sin() for the per-frame animations (pulse, breath,
+# wobble); a table lookup is cheaper than a libm call per target per frame.
+SIN_LUT = np.sin(np.linspace(0, 2 * np.pi, 256, endpoint=False)).astype(np.float32)
+SIN_LUT_SCALE = 256 / (2 * math.pi)
 
-def lerp(a, b, t):
-    return int(a + (b - a) * t)
 
+def fast_sin(t, rate):
+    """Approximate sin(t * rate) via the 256-entry lookup table."""
+    return float(SIN_LUT[int(t * rate * SIN_LUT_SCALE) & 0xff])
 
-def lerp_pt(p1, p2, t):
-    return (lerp(p1[0], p2[0], t), lerp(p1[1], p2[1], t))
 
+# ─── Sprites ──────────────────────────────────────────────────────────────────
 
-def midpoint(p1, p2):
-    return ((p1[0] + p2[0]) // 2, (p1[1] + p2[1]) // 2)
+@functools.lru_cache(maxsize=None)
+def glow_sprite(radius, colour, intensity):
+    """Glow rings around a circle of `radius`, centred in the sprite."""
+    rings = [(r, intensity * ((radius + 18 - r) / 18))
+             for r in range(radius + 18, radius, -2)]
+    return rings_sprite(radius + 20, colour, rings)
 
 
 def glow_circle(img, centre, radius, colour, intensity=0.45):
     """Soft glow effect around a circle."""
-    overlay = img.copy()
-    for r in range(radius + 18, radius, -2):
-        alpha = intensity * ((radius + 18 - r) / 18)
-        cv2.circle(overlay, centre, r, colour, 2, cv2.LINE_AA)
-        cv2.addWeighted(overlay, alpha, img, 1 - alpha, 0, img)
-        overlay = img.copy()
-
-
-def rounded_rect(img, pt1, pt2, colour, radius=12, thickness=-1, alpha=0.75):
-    """Draw a rounded rectangle with transparency."""
-    overlay = img.copy()
-    x1, y1 = pt1
-    x2, y2 = pt2
-    # Main body
-    cv2.rectangle(overlay, (x1 + radius, y1), (x2 - radius, y2), colour, thickness)
-    cv2.rectangle(overlay, (x1, y1 + radius), (x2, y2 - radius), colour, thickness)
-    # Corners
-    cv2.ellipse(overlay, (x1 + radius, y1 + radius), (radius, radius), 180, 0, 90, colour, thickness)
-    cv2.ellipse(overlay, (x2 - radius, y1 + radius), (radius, radius), 270, 0, 90, colour, thickness)
-    cv2.ellipse(overlay, (x1 + radius, y2 - radius), (radius, radius),  90, 0, 90, colour, thickness)
-    cv2.ellipse(overlay, (x2 - radius, y2 - radius), (radius, radius),   0, 0, 90, colour, thickness)
-    cv2.addWeighted(overlay, alpha, img, 1 - alpha, 0, img)
+    c = radius + 20
+    blit_bgra(img, glow_sprite(radius, colour, intensity),
+              (centre[0] - c, centre[1] - c))
 
 
 # ─── Anatomical Point Computation ────────────────────────────────────────────
-
-def get_body_anchors(plm, w, h):
+#
+#  The per-frame geometry is JIT-compiled with Numba when it is installed;
+#  the kernels take and return plain int32 arrays so they also run
+#  unchanged (just slower) as ordinary Python when it is not.
+
+LUNG_NAMES = ("R Apex", "L Apex", "R Upper", "L Upper",
+              "R Middle", "R Lower", "L Lower")
+CARDIAC_NAMES = ("Aortic", "Pulmonic", "Erb's Pt", "Tricuspid", "Mitral")
+
+# Target offsets from the top-of-sternum origin, as fractions of
+# (shoulder width, torso height).  Rows follow the *_NAMES order.
+# Midclavicular line ≈ 32% of shoulder width, sternal border ≈ 12%.
+LUNG_TABLE = np.array([
+    (-0.32, 0.03), (0.32, 0.03),    # Apices – just below clavicle
+    (-0.32, 0.14), (0.32, 0.14),    # Upper lobes – 2nd intercostal space
+    (-0.32, 0.32),                  # Right middle lobe – 4th intercostal
+    (-0.32, 0.50), (0.32, 0.50),    # Lower lobes – 6th intercostal space
+], dtype=np.float32)
+CARDIAC_TABLE = np.array([
+    (-0.12, 0.12),                  # Aortic
+    ( 0.12, 0.12),                  # Pulmonic
+    ( 0.12, 0.22),                  # Erb's Pt
+    ( 0.12, 0.32),                  # Tricuspid
+    ( 0.32, 0.40),                  # Mitral
+], dtype=np.float32)
+
+
+def get_body_anchors(pose_px):
     """Return pixel coords for key body anchors."""
-    ls = px(plm[11], w, h)   # left shoulder
-    rs = px(plm[12], w, h)   # right shoulder
-    lh = px(plm[23], w, h)   # left hip
-    rh = px(plm[24], w, h)   # right hip
+    ls = tuple(pose_px[11].tolist())   # left shoulder
+    rs = tuple(pose_px[12].tolist())   # right shoulder
+    lh = tuple(pose_px[23].tolist())   # left hip
+    rh = tuple(pose_px[24].tolist())   # right hip
     return ls, rs, lh, rh
 
 
-def compute_lung_points(plm, w, h):
-    """Anatomically precise anterior lung auscultation sites."""
-    ls, rs, lh, rh = get_body_anchors(plm, w, h)
-
-    torso_h = int(((lh[1] - ls[1]) + (rh[1] - rs[1])) / 2)
-    mid_x   = (ls[0] + rs[0]) // 2
-    top_y   = (ls[1] + rs[1]) // 2
-
-    # Midclavicular line offset (~35% of half-shoulder-width from midline)
-    mcl = int(abs(rs[0] - ls[0]) * 0.32)
-    # Sternal border offset (~12%)
-    stb = int(abs(rs[0] - ls[0]) * 0.12)
-
-    return [
-        # Apices – just below clavicle
-        {"name": "R Apex",       "pos": (mid_x - mcl, top_y + int(torso_h * 0.03)), "side": "R"},
-        {"name": "L Apex",       "pos": (mid_x + mcl, top_y + int(torso_h * 0.03)), "side": "L"},
-        # Upper lobes – 2nd intercostal space
-        {"name": "R Upper",      "pos": (mid_x - mcl, top_y + int(torso_h * 0.14)), "side": "R"},
-        {"name": "L Upper",      "pos": (mid_x + mcl, top_y + int(torso_h * 0.14)), "side": "L"},
-        # Right middle lobe – 4th intercostal
-        {"name": "R Middle",     "pos": (mid_x - mcl, top_y + int(torso_h * 0.32)), "side": "R"},
-        # Lower lobes – 6th intercostal space
-        {"name": "R Lower",      "pos": (mid_x - mcl, top_y + int(torso_h * 0.50)), "side": "R"},
-        {"name": "L Lower",      "pos": (mid_x + mcl, top_y + int(torso_h * 0.50)), "side": "L"},
-    ], (ls, rs, lh, rh)
-
-
-def compute_cardiac_points(plm, w, h):
-    """Anatomically precise cardiac auscultation sites."""
-    ls, rs, lh, rh = get_body_anchors(plm, w, h)
+@njit(cache=True)
+def compute_points(pose_px, table):
+    """Target pixel positions, one row per row of `table`."""
+    ls, rs, lh, rh = pose_px[11], pose_px[12], pose_px[23], pose_px[24]
+
+    torso_h = ((lh[1] - ls[1]) + (rh[1] - rs[1])) / 2
+    origin = np.array([(ls[0] + rs[0]) // 2, (ls[1] + rs[1]) // 2], np.float32)
+    scale = np.array([abs(rs[0] - ls[0]), torso_h], np.float32)
+    return (origin + table * scale).astype(np.int32)
+
 
-    torso_h = int(((lh[1] - ls[1]) + (rh[1] - rs[1])) / 2)
-    mid_x   = (ls[0] + rs[0]) // 2
-    top_y   = (ls[1] + rs[1]) // 2
+def warm_up_jit():
+    """Compile the kernels up front so the first frame doesn't stall."""
+    pose_px = np.zeros((33, 2), np.int32)
+    hands = np.zeros((1, 2), np.int32)
+    for table in (LUNG_TABLE, CARDIAC_TABLE):
+        align_targets(hands, compute_points(pose_px, table), 1)
 
-    mcl = int(abs(rs[0] - ls[0]) * 0.32)
-    stb = int(abs(rs[0] - ls[0]) * 0.12)
 
-    return [
-        {"name": "Aortic",   "pos": (mid_x - stb, top_y + int(torso_h * 0.12)), "side": "R"},
-        {"name": "Pulmonic", "pos": (mid_x + stb, top_y + int(torso_h * 0.12)), "side": "L"},
-        {"name": "Erb's Pt", "pos": (mid_x + stb, top_y + int(torso_h * 0.22)), "side": "L"},
-        {"name": "Tricuspid","pos": (mid_x + stb, top_y + int(torso_h * 0.32)), "side": "L"},
-        {"name": "Mitral",   "pos": (mid_x + mcl, top_y + int(torso_h * 0.40)), "side": "L"},
-    ], (ls, rs, lh, rh)
+def new_checklist(mode):
+    """Fresh visited-flags dict for every target of `mode`."""
+    return dict.fromkeys(LUNG_NAMES if mode == "lung" else CARDIAC_NAMES, False)
+
+
+def compute_lung_points(pose_px):
+    """Anatomically precise anterior lung auscultation sites."""
+    return compute_points(pose_px, LUNG_TABLE), LUNG_NAMES, get_body_anchors(pose_px)
+
+
+def compute_cardiac_points(pose_px):
+    """Anatomically precise cardiac auscultation sites."""
+    return compute_points(pose_px, CARDIAC_TABLE), CARDIAC_NAMES, get_body_anchors(pose_px)
 
 
 # ─── Drawing Functions ───────────────────────────────────────────────────────
@@ -188,9 +220,16 @@ def draw_torso_zone(frame, anchors):
     """Subtle translucent torso highlight with faint grid lines."""
     ls, rs, lh, rh = anchors
     pts = np.array([rs, ls, lh, rh], dtype=np.int32)
-    overlay = frame.copy()
-    cv2.fillPoly(overlay, [pts], (50, 45, 35))
-    cv2.addWeighted(overlay, 0.18, frame, 0.82, 0, frame)
+
+    # Blend only the torso's bounding box, not the whole frame
+    h, w = frame.shape[:2]
+    x0, y0 = np.maximum(pts.min(axis=0), 0).tolist()
+    x1, y1 = np.minimum(pts.max(axis=0) + 1, (w, h)).tolist()
+    if x0 < x1 and y0 < y1:
+        roi = frame[y0:y1, x0:x1]
+        overlay = roi.copy()
+        cv2.fillPoly(overlay, [pts], (50, 45, 35), offset=(-x0, -y0))
+        cv2.addWeighted(overlay, 0.18, roi, 0.82, 0, roi)
     cv2.polylines(frame, [pts], True, (80, 75, 65), 1, cv2.LINE_AA)
 
     # Faint horizontal grid lines across the torso
@@ -201,36 +240,80 @@ def draw_torso_zone(frame, anchors):
                  (55, 50, 45), 1, cv2.LINE_AA)
 
 
-def draw_skeleton_minimal(frame, plm, w, h):
+def draw_skeleton_minimal(frame, pose_px):
     """Thin, elegant skeleton overlay."""
-    CONNS = [
-        (11,12),(11,13),(13,15),(12,14),(14,16),
-        (11,23),(12,24),(23,24),(23,25),(24,26),(25,27),(26,28),
-    ]
-    for a, b in CONNS:
-        cv2.line(frame, px(plm[a], w, h), px(plm[b], w, h),
-                 SKELETON_COL, 1, cv2.LINE_AA)
-    for i in [11,12,13,14,15,16,23,24,25,26,27,28]:
-        cv2.circle(frame, px(plm[i], w, h), 3, SKELETON_COL, -1, cv2.LINE_AA)
-
-
-def draw_hand(frame, hlm, w, h):
+    cv2.polylines(frame, list(pose_px[SKEL_SEG_IDX]), False,
+                  SKELETON_COL, 1, cv2.LINE_AA)
+    for p in pose_px[SKEL_JOINT_IDX].tolist():
+        cv2.circle(frame, p, 3, SKELETON_COL, -1, cv2.LINE_AA)
+
+
+def draw_hand(frame, hand_px):
     """Sleek hand wireframe."""
-    CONNS = [
-        (0,1),(1,2),(2,3),(3,4),(0,5),(5,6),(6,7),(7,8),
-        (5,9),(9,10),(10,11),(11,12),(9,13),(13,14),(14,15),(15,16),
-        (13,17),(17,18),(18,19),(19,20),(0,17),
-    ]
-    for a, b in CONNS:
-        cv2.line(frame, px(hlm[a], w, h), px(hlm[b], w, h),
-                 HAND_SKEL, 1, cv2.LINE_AA)
-    for i in range(21):
-        cv2.circle(frame, px(hlm[i], w, h), 2, ACCENT_CYAN, -1, cv2.LINE_AA)
-
-
-def draw_target(frame, t, is_aligned, is_visited, mode_col, t_now):
+    cv2.polylines(frame, list(hand_px[HAND_SEG_IDX]), False,
+                  HAND_SKEL, 1, cv2.LINE_AA)
+    for p in hand_px.tolist():
+        cv2.circle(frame, p, 2, ACCENT_CYAN, -1, cv2.LINE_AA)
+
+
+def render_pill(label):
+    """Label text baked onto its translucent pill as one BGRA sprite.
+
+    The sprite's top-left sits at (text_x - 4, baseline_y - text_h - 2).
+    """
+    (tw, th), base = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.35, 1)
+    pill = rounded_rect_sprite(tw + 8, th + 5, BG_PANEL, 4, -1, 0.65)
+
+    # Canvas also covers any descenders hanging below the pill
+    bg_a = np.zeros((th + 3 + max(3, base), tw + 9), np.float32)
+    bg_a[:pill.shape[0]] = pill[..., 3] / 255
+    text = np.zeros(bg_a.shape, np.uint8)
+    cv2.putText(text, label, (4, th + 2),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.35, 255, 1, cv2.LINE_AA)
+
+    # Composite "text over pill" into straight (non-premultiplied) alpha
+    c = text / 255
+    a = c + (1 - c) * bg_a
+    col = (c[..., None] * WHITE + ((1 - c) * bg_a)[..., None] * BG_PANEL) \
+        / np.maximum(a, 1e-6)[..., None]
+
+    sprite = np.empty(bg_a.shape + (4,), np.uint8)
+    sprite[..., :3] = np.rint(col)
+    sprite[..., 3] = np.rint(a * 255)
+    return sprite
+
+
+# Target labels never change, so their metrics and pills are built once
+LABEL_SIZES = {name: cv2.getTextSize(name, cv2.FONT_HERSHEY_SIMPLEX, 0.35, 1)[0]
+               for name in LUNG_NAMES + CARDIAC_NAMES}
+LABEL_PILLS = {name: render_pill(name) for name in LUNG_NAMES + CARDIAC_NAMES}
+
+
+@functools.lru_cache(maxsize=None)
+def target_sprite(r, col):
+    """Filled dot, white border and crosshair ticks, centred in the sprite.
+
+    Only a handful of (radius, colour) pairs exist – one per target state
+    and mode – so each is rendered once and reused for every target.
+    """
+    c = r + 6
+
+    def render(img):
+        # Filled dot
+        cv2.circle(img, (c, c), r, col, -1, cv2.LINE_AA)
+        # White border
+        cv2.circle(img, (c, c), r, WHITE, 1, cv2.LINE_AA)
+        # Crosshair through the point
+        cv2.line(img, (c - r - 4, c), (c - r, c), DIM_WHITE, 1, cv2.LINE_AA)
+        cv2.line(img, (c + r, c), (c + r + 4, c), DIM_WHITE, 1, cv2.LINE_AA)
+        cv2.line(img, (c, c - r - 4), (c, c - r), DIM_WHITE, 1, cv2.LINE_AA)
+        cv2.line(img, (c, c + r), (c, c + r + 4), DIM_WHITE, 1, cv2.LINE_AA)
+
+    return bake_bgra((2 * c + 1, 2 * c + 1), render)
+
+
+def draw_target(frame, label, pos, is_aligned, is_visited, mode_col, t_now):
     """Draw a single auscultation target with glow effects."""
-    pos = t["pos"]
 
     if is_aligned:
         col = LUNG_ACTIVE if mode_col == "lung" else CARD_ACTIVE
@@ -238,7 +321,7 @@ def draw_target(frame, t, is_aligned, is_visited, mode_col, t_now):
         # Glow
         glow_circle(frame, pos, r, col, 0.35)
         # Pulsing outer ring
-        pulse = int(5 * abs(math.sin(t_now * 4)))
+        pulse = int(5 * abs(fast_sin(t_now, 4)))
         cv2.circle(frame, pos, r + 6 + pulse, col, 2, cv2.LINE_AA)
     elif is_visited:
         col = LUNG_VISITED if mode_col == "lung" else CARD_VISITED
@@ -247,40 +330,30 @@ def draw_target(frame, t, is_aligned, is_visited, mode_col, t_now):
         col = LUNG_DEFAULT if mode_col == "lung" else CARD_DEFAULT
         r = POINT_R
         # Subtle breathing animation for unvisited
-        breath = int(2 * abs(math.sin(t_now * 1.5)))
+        breath = int(2 * abs(fast_sin(t_now, 1.5)))
         cv2.circle(frame, pos, r + breath + 4, col, 1, cv2.LINE_AA)
 
-    # Filled dot
-    cv2.circle(frame, pos, r, col, -1, cv2.LINE_AA)
-    # White border
-    cv2.circle(frame, pos, r, WHITE, 1, cv2.LINE_AA)
-
-    # Crosshair through the point
+    # Dot, border and crosshair (pre-rendered)
     cx, cy = pos
-    cv2.line(frame, (cx - r - 4, cy), (cx - r, cy), DIM_WHITE, 1, cv2.LINE_AA)
-    cv2.line(frame, (cx + r, cy), (cx + r + 4, cy), DIM_WHITE, 1, cv2.LINE_AA)
-    cv2.line(frame, (cx, cy - r - 4), (cx, cy - r), DIM_WHITE, 1, cv2.LINE_AA)
-    cv2.line(frame, (cx, cy + r), (cx, cy + r + 4), DIM_WHITE, 1, cv2.LINE_AA)
-
-    # Label with a tiny background pill
-    label = t["name"]
-    (tw, th), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.35, 1)
+    blit_bgra(frame, target_sprite(r, col), (cx - r - 6, cy - r - 6))
+
+    # Label with a tiny background pill (pre-rendered)
+    tw, th = LABEL_SIZES[label]
     lx = cx - tw // 2
     ly = cy - r - 10
-    # Background pill
-    rounded_rect(frame, (lx - 4, ly - th - 2), (lx + tw + 4, ly + 3),
-                 BG_PANEL, radius=4, alpha=0.65)
-    cv2.putText(frame, label, (lx, ly),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.35, WHITE, 1, cv2.LINE_AA)
+    blit_bgra(frame, LABEL_PILLS[label], (lx - 4, ly - th - 2))
 
     return is_aligned
 
 
-def draw_hud(frame, visited, total, mode, fps, w, h, t_now):
-    """Premium heads-up display panel."""
+HUD_ORIGIN = (12, 50)
+
+
+def render_hud(frame, checklist, total, mode):
+    """Paint the HUD panel with its top-left corner at (0, 0)."""
     panel_w = 240
     panel_h = 60 + total * 24 + 50
-    px1, py1 = 12, 50
+    px1, py1 = 0, 0
     px2, py2 = px1 + panel_w, py1 + panel_h
 
     rounded_rect(frame, (px1, py1), (px2, py2), BG_PANEL, radius=14, alpha=0.80)
@@ -298,9 +371,7 @@ def draw_hud(frame, visited, total, mode, fps, w, h, t_now):
     # Checklist
     y = py1 + 52
     done_count = 0
-    names_sorted = sorted(visited.keys())
-    for name in names_sorted:
-        ok = visited[name]
+    for name, ok in checklist:
         if ok:
             done_count += 1
         icon_col = ACCENT_GREEN if ok else (80, 80, 90)
@@ -341,8 +412,24 @@ def draw_hud(frame, visited, total, mode, fps, w, h, t_now):
                 cv2.FONT_HERSHEY_SIMPLEX, 0.32, DIM_WHITE, 1, cv2.LINE_AA)
 
 
-def draw_top_bar(frame, w, mode, fps):
-    """Top status bar."""
+@functools.lru_cache(maxsize=8)
+def hud_sprite(mode, checklist, total):
+    """The whole HUD panel for one checklist state, baked to BGRA."""
+    # Extra width on the right for the percentage beside the bar
+    size = (240 + 40, 60 + total * 24 + 50 + 1)
+    return bake_bgra(size, lambda img: render_hud(img, checklist, total, mode))
+
+
+def draw_hud(frame, visited, total, mode):
+    """Premium heads-up display panel."""
+    # Rebuilt only when the mode or a checklist entry changes; rows are
+    # listed alphabetically, as the panel always has been
+    sprite = hud_sprite(mode, tuple(sorted(visited.items())), total)
+    blit_bgra(frame, sprite, HUD_ORIGIN)
+
+
+def render_top_bar(frame, w, mode):
+    """Paint the static parts of the top status bar."""
     rounded_rect(frame, (0, 0), (w, 36), BG_PANEL, radius=0, alpha=0.70)
 
     # Title
@@ -354,15 +441,25 @@ def draw_top_bar(frame, w, mode, fps):
     cv2.putText(frame, mode_text, (w // 2 - 40, 24),
                 cv2.FONT_HERSHEY_SIMPLEX, 0.42, DIM_WHITE, 1, cv2.LINE_AA)
 
-    # FPS
-    cv2.putText(frame, f"FPS {int(fps)}", (w - 80, 24),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.42, DIM_WHITE, 1, cv2.LINE_AA)
-
     # Controls hint
     cv2.putText(frame, "Q:Quit  R:Reset  M:Mode", (w - 220, 24),
                 cv2.FONT_HERSHEY_SIMPLEX, 0.32, (100, 100, 100), 1, cv2.LINE_AA)
 
 
+@functools.lru_cache(maxsize=4)
+def top_bar_sprite(w, mode):
+    return bake_bgra((w + 1, 37), lambda img: render_top_bar(img, w, mode))
+
+
+def draw_top_bar(frame, w, mode, fps):
+    """Top status bar."""
+    blit_bgra(frame, top_bar_sprite(w, mode), (0, 0))
+
+    # FPS is the only part that changes from frame to frame
+    cv2.putText(frame, f"FPS {int(fps)}", (w - 80, 24),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.42, DIM_WHITE, 1, cv2.LINE_AA)
+
+
 def draw_status_bar(frame, w, h, all_done, mode):
     """Bottom status banner."""
     bar_h = 40
@@ -372,8 +469,7 @@ def draw_status_bar(frame, w, h, all_done, mode):
         text = "ALL POINTS CHECKED - EXAM COMPLETE"
         col  = ACCENT_GREEN
         # Animated checkmark
-        t = time.time()
-        scale = 0.55 + 0.03 * math.sin(t * 3)
+        scale = 0.55 + 0.03 * fast_sin(time.time(), 3)
         cv2.putText(frame, text, (w // 2 - 200, h - 12),
                     cv2.FONT_HERSHEY_SIMPLEX, scale, col, 2, cv2.LINE_AA)
     else:
@@ -382,156 +478,380 @@ def draw_status_bar(frame, w, h, all_done, mode):
                     cv2.FONT_HERSHEY_SIMPLEX, 0.48, DIM_WHITE, 1, cv2.LINE_AA)
 
 
+# ─── Pipeline Stages ──────────────────────────────────────────────────────────
+#
+#   capture ──► pose detect_async ──┐
+#           └─► hand detect_async ──┴──► ResultBuffer ──► render (main thread)
+#
+#  Both landmarkers run in LIVE_STREAM mode: frames are pushed into the
+#  MediaPipe graphs as fast as the camera delivers them and results come
+#  back on MediaPipe's own threads, so pose and hand inference overlap with
+#  each other, with capture, and with rendering.  The graphs drop frames
+#  they cannot keep up with, so results are re-joined by timestamp.
+
+class ResultBuffer:
+    """Joins async pose/hand results back up with the frame they came from."""
+
+    def __init__(self, history=8, hand_stale_ms=100):
+        self.cond = threading.Condition()
+        self.frames = {}            # ts -> mirrored BGR frame
+        self.slots = {}             # ts -> [pose_res, hand_res]
+        self.last_hand = (-1, None)
+        self.hand_pending = set()   # ts sent to the hand model, no result yet
+        self.history = history
+        self.hand_stale_ms = hand_stale_ms
+        # Mirrored-frame buffers: `history` queued, one being rendered and
+        # one being filled.  A buffer is only reused once it has been
+        # evicted, skipped or release()d by the render stage.
+        self.max_buffers = history + 2
+        self.n_buffers = 0
+        self.free = []
+
+    def acquire(self, like, stop):
+        """A frame buffer shaped like `like` that no other stage holds.
+
+        Blocks (until `stop`) if the render stage still holds every
+        buffer, so capture can never overwrite a frame being drawn on.
+        """
+        with self.cond:
+            while not self.free and self.n_buffers >= self.max_buffers:
+                if stop.is_set():
+                    return None
+                self.cond.wait(0.1)
+            if self.free:
+                return self.free.pop()
+            self.n_buffers += 1
+        return np.empty_like(like)
+
+    def release(self, frame):
+        """Hand a frame returned by take() back for reuse."""
+        with self.cond:
+            self.free.append(frame)
+            self.cond.notify_all()
+
+    def add_frame(self, ts, frame, with_hand=True):
+        with self.cond:
+            self.frames[ts] = frame
+            if with_hand:
+                self.hand_pending.add(ts)
+            if len(self.frames) > self.history:
+                self.free.append(self.frames.pop(min(self.frames)))
+                self.cond.notify_all()
+
+    def on_pose(self, res, image, ts):
+        with self.cond:
+            self.slots.setdefault(ts, [None, None])[0] = res
+            self.cond.notify_all()
+
+    def on_hand(self, res, image, ts):
+        with self.cond:
+            self.slots.setdefault(ts, [None, None])[1] = res
+            self.hand_pending.discard(ts)
+            if ts > self.last_hand[0]:
+                self.last_hand = (ts, res)
+            self.cond.notify_all()
+
+    def _ready(self):
+        posed = [ts for ts, (p, _) in self.slots.items() if p is not None]
+        if not posed:
+            return None
+        ts = max(posed)
+        pose_res, hand_res = self.slots[ts]
+        if hand_res is None:
+            # Hand result for this frame is still in flight – give it a
+            # moment, then fall back to the newest one we have.  Frames the
+            # hand model skipped go straight to the newest one.
+            hand_ts, last = self.last_hand
+            if (ts in self.hand_pending and hand_ts < ts
+                    and ts - hand_ts < self.hand_stale_ms):
+                return None
+            hand_res = last
+        return ts, pose_res, hand_res
+
+    def take(self, timeout=0.1):
+        """Newest renderable (ts, frame, pose_res, hand_res), or None.
+
+        The caller owns the frame until it passes it to release().
+        """
+        with self.cond:
+            ready = self._ready()
+            if ready is None:
+                self.cond.wait(timeout)
+                ready = self._ready()
+            if ready is None:
+                return None
+
+            ts, pose_res, hand_res = ready
+            self.slots = {k: v for k, v in self.slots.items() if k > ts}
+            self.hand_pending = {k for k in self.hand_pending if k > ts}
+            frame = self.frames.pop(ts, None)
+            for k in [k for k in self.frames if k < ts]:
+                self.free.append(self.frames.pop(k))
+            self.cond.notify_all()
+            return ts, frame, pose_res, hand_res
+
+
+def open_camera(index=0):
+    """Open the webcam as 30 fps MJPG at CAM_W x CAM_H.
+
+    Uncompressed YUYV at 720p saturates USB on most webcams and caps them
+    at 5-10 fps; MJPG keeps the camera at full rate.  V4L2 is preferred on
+    Linux so the FOURCC request reaches the driver.
+    """
+    cap = None
+    if sys.platform.startswith("linux"):
+        cap = cv2.VideoCapture(index, cv2.CAP_V4L2)
+    if cap is None or not cap.isOpened():
+        cap = cv2.VideoCapture(index)
+    if not cap.isOpened():
+        return None
+
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAM_W)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAM_H)
+    cap.set(cv2.CAP_PROP_FPS, 30)
+
+    fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+    fourcc = "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4))
+    print(f"[INFO] Camera format {fourcc!r} @ {cap.get(cv2.CAP_PROP_FPS):.0f} fps")
+    return cap
+
+
+def capture_worker(cap, pose_lm, hand_lm, buf, stop, hand_every=1,
+                   use_ocl=False):
+    """Grab, mirror and wrap frames, feeding both landmarkers.
+
+    Pose runs on every frame; hands move slowly enough at 30 fps that the
+    hand model only runs on every `hand_every`-th frame and the render
+    stage reuses its last result in between.  With `use_ocl` the
+    downscale and colour conversion run on the OpenCL device.
+    """
+    frame_idx = 0
+    # Preallocated outputs for resize / cvtColor.  mp.Image copies its
+    # input, so single inference buffers suffice; mirrored frames are handed
+    # on to the render stage, so they come from the ResultBuffer's pool.
+    small_buf = None
+    rgb_buf = None
+    while not stop.is_set():
+        ret, raw = cap.read()
+        if not ret:
+            break
+
+        if small_buf is None:
+            h, w = raw.shape[:2]
+            infer_size = (INFER_W, round(h * INFER_W / w))
+            small_buf = np.empty((infer_size[1], infer_size[0], 3), np.uint8)
+            rgb_buf = np.empty_like(small_buf)
+
+        frame = buf.acquire(raw, stop)
+        if frame is None:
+            break
+        cv2.flip(raw, 1, dst=frame)
+        if use_ocl:
+            # Only the small RGB result is downloaded for MediaPipe
+            small = cv2.resize(cv2.UMat(frame), infer_size,
+                               interpolation=cv2.INTER_AREA)
+            rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB).get()
+        else:
+            cv2.resize(frame, infer_size, dst=small_buf, interpolation=cv2.INTER_AREA)
+            rgb = cv2.cvtColor(small_buf, cv2.COLOR_BGR2RGB, dst=rgb_buf)
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+        frame_idx += 1
+        ts = int(frame_idx * (1000 / 30))
+
+        run_hand = frame_idx % hand_every == 0
+        buf.add_frame(ts, frame, with_hand=run_hand)
+        pose_lm.detect_async(mp_image, ts)
+        if run_hand:
+            hand_lm.detect_async(mp_image, ts)
+
+
 # ─── Main ─────────────────────────────────────────────────────────────────────
 
-def main():
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Hand & Lung/Chest Alignment Tracker"
+    )
+
+    parser.add_argument(
+        "--hand-every",
+        type=int,
+        default=2,
+        help="Run the hand landmarker on every Nth frame (default: 2)"
+    )
+
+    parser.add_argument(
+        "--no-opencl",
+        action="store_true",
+        help="Keep all OpenCV work on the CPU even if OpenCL is available"
+    )
+
+    args = parser.parse_args()
+    if args.hand_every < 1:
+        parser.error("--hand-every must be at least 1")
+    return args
+
+
+def main(hand_every=2, opencl=True):
     ensure_model(POSE_MODEL, POSE_URL)
     ensure_model(HAND_MODEL, HAND_URL)
+    warm_up_jit()
+    use_ocl = configure_opencl(opencl)
+    # Leave half the cores to the MediaPipe graphs
+    cv2.setNumThreads(max(1, (os.cpu_count() or 2) // 2))
 
     BaseOptions = mp_python.BaseOptions
+    delegate = pick_delegate(POSE_MODEL)
+    buf = ResultBuffer()
 
     pose_opts = vision.PoseLandmarkerOptions(
-        base_options=BaseOptions(model_asset_path=POSE_MODEL),
-        running_mode=vision.RunningMode.VIDEO,
+        base_options=BaseOptions(model_asset_path=POSE_MODEL,
+                                 delegate=delegate),
+        running_mode=vision.RunningMode.LIVE_STREAM,
         num_poses=1,
         min_pose_detection_confidence=0.5,
         min_pose_presence_confidence=0.5,
         min_tracking_confidence=0.5,
+        result_callback=buf.on_pose,
     )
     hand_opts = vision.HandLandmarkerOptions(
-        base_options=BaseOptions(model_asset_path=HAND_MODEL),
-        running_mode=vision.RunningMode.VIDEO,
+        base_options=BaseOptions(model_asset_path=HAND_MODEL,
+                                 delegate=delegate),
+        running_mode=vision.RunningMode.LIVE_STREAM,
         num_hands=2,
         min_hand_detection_confidence=0.5,
         min_hand_presence_confidence=0.5,
         min_tracking_confidence=0.5,
+        result_callback=buf.on_hand,
     )
 
-    cap = cv2.VideoCapture(0)
-    if not cap.isOpened():
+    cap = open_camera(0)
+    if cap is None:
         print("[ERROR] Cannot open webcam.")
         return
 
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
-
     mode = "lung"                       # "lung" or "cardiac"
-    visited = {}
+    # Target names are fixed per mode, so the checklist is only rebuilt on
+    # a mode change.  Owned by the render stage only.
+    visited = new_checklist(mode)
     prev_time = time.time()
 
-    with vision.PoseLandmarker.create_from_options(pose_opts) as pose_lm, \
-         vision.HandLandmarker.create_from_options(hand_opts) as hand_lm:
-
-        frame_idx = 0
-
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            frame = cv2.flip(frame, 1)
-            h, w, _ = frame.shape
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
-            frame_idx += 1
-            ts = int(frame_idx * (1000 / 30))
-
-            pose_res = pose_lm.detect_for_video(mp_image, ts)
-            hand_res = hand_lm.detect_for_video(mp_image, ts)
-
-            t_now = time.time()
-
-            if pose_res.pose_landmarks and len(pose_res.pose_landmarks) > 0:
-                plm = pose_res.pose_landmarks[0]
-
-                draw_skeleton_minimal(frame, plm, w, h)
-
-                # Compute targets based on mode
-                if mode == "lung":
-                    targets, anchors = compute_lung_points(plm, w, h)
-                else:
-                    targets, anchors = compute_cardiac_points(plm, w, h)
-
-                draw_torso_zone(frame, anchors)
-
-                # Sync visited dict with current targets
-                current_names = {t["name"] for t in targets}
-                visited = {k: v for k, v in visited.items() if k in current_names}
-                for t in targets:
-                    if t["name"] not in visited:
-                        visited[t["name"]] = False
-
-                # Hand positions
-                hand_positions = []
-                if hand_res.hand_landmarks:
-                    for hlm in hand_res.hand_landmarks:
-                        draw_hand(frame, hlm, w, h)
-                        # Palm centre = landmark 9
-                        hc = px(hlm[9], w, h)
-                        hand_positions.append(hc)
-
-                # Draw targets & check alignment
-                for t in targets:
-                    aligned = False
-                    for hp in hand_positions:
-                        if dist(hp, t["pos"]) < ALIGNMENT_RADIUS:
-                            aligned = True
-                            visited[t["name"]] = True
+    try:
+        with vision.PoseLandmarker.create_from_options(pose_opts) as pose_lm, \
+             vision.HandLandmarker.create_from_options(hand_opts) as hand_lm:
+
+            stop = threading.Event()
+            capture = threading.Thread(target=capture_worker,
+                                       args=(cap, pose_lm, hand_lm, buf, stop,
+                                             max(1, hand_every), use_ocl),
+                                       daemon=True)
+            capture.start()
+            try:
+                while True:
+                    item = buf.take()
+                    if item is None:
+                        if not capture.is_alive():
                             break
-
-                    mode_col = "lung" if mode == "lung" else "cardiac"
-                    draw_target(frame, t, aligned, visited.get(t["name"], False),
-                                mode_col, t_now)
-
-                    # Connection line when aligned
-                    if aligned:
-                        for hp in hand_positions:
-                            if dist(hp, t["pos"]) < ALIGNMENT_RADIUS:
-                                # Dashed-style line
-                                cv2.line(frame, hp, t["pos"],
+                        continue
+
+                    _, frame, pose_res, hand_res = item
+                    if frame is None:
+                        continue
+                    h, w, _ = frame.shape
+
+                    t_now = time.time()
+
+                    if pose_res.pose_landmarks and len(pose_res.pose_landmarks) > 0:
+                        # Landmark -> pixel conversion happens once per frame
+                        pose_px = landmarks_to_px(pose_res.pose_landmarks[0], w, h)
+
+                        draw_skeleton_minimal(frame, pose_px)
+
+                        # Compute targets based on mode
+                        if mode == "lung":
+                            positions, names, anchors = compute_lung_points(pose_px)
+                        else:
+                            positions, names, anchors = compute_cardiac_points(pose_px)
+
+                        draw_torso_zone(frame, anchors)
+
+                        # Hand positions
+                        hand_positions = []
+                        if hand_res and hand_res.hand_landmarks:
+                            for hlm in hand_res.hand_landmarks:
+                                hand_px = landmarks_to_px(hlm, w, h)
+                                draw_hand(frame, hand_px)
+                                # Palm centre = landmark 9
+                                hand_positions.append(tuple(hand_px[9].tolist()))
+
+                        # Nearest hand and alignment for every target in one kernel
+                        hands_np = np.array(hand_positions, dtype=np.int32).reshape(-1, 2)
+                        aligned_mask, nearest_hand = align_targets(
+                            hands_np, positions, ALIGNMENT_R2)
+
+                        # Draw targets
+                        mode_col = "lung" if mode == "lung" else "cardiac"
+                        for i, (name, pos) in enumerate(zip(names, positions.tolist())):
+                            pos = tuple(pos)
+                            aligned = bool(aligned_mask[i])
+                            if aligned:
+                                visited[name] = True
+
+                            draw_target(frame, name, pos, aligned, visited[name],
+                                        mode_col, t_now)
+
+                            # Connection line from the nearest hand when aligned
+                            if aligned:
+                                cv2.line(frame, hand_positions[nearest_hand[i]], pos,
                                          ACCENT_GREEN if mode == "lung" else ACCENT_AMBER,
                                          2, cv2.LINE_AA)
-                                break
-
-                # HUD
-                curr_time = time.time()
-                fps = 1.0 / (curr_time - prev_time + 1e-9)
-                prev_time = curr_time
-
-                draw_hud(frame, visited, len(targets), mode, fps, w, h, t_now)
-                draw_top_bar(frame, w, mode, fps)
-
-                all_done = all(visited.values()) if visited else False
-                draw_status_bar(frame, w, h, all_done, mode)
-
-            else:
-                # No body detected
-                cv2.putText(frame, "Step into frame", (w // 2 - 100, h // 2 - 10),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.8, ACCENT_RED, 2, cv2.LINE_AA)
-                cv2.putText(frame, "Ensure upper body is visible",
-                            (w // 2 - 150, h // 2 + 25),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, DIM_WHITE, 1, cv2.LINE_AA)
-
-                curr_time = time.time()
-                fps = 1.0 / (curr_time - prev_time + 1e-9)
-                prev_time = curr_time
-                draw_top_bar(frame, w, mode, fps)
-
-            cv2.imshow("Hand & Lung Alignment Tracker", frame)
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q'):
-                break
-            elif key == ord('r'):
-                visited = {k: False for k in visited}
-            elif key == ord('m'):
-                mode = "cardiac" if mode == "lung" else "lung"
-                visited = {}
-
-    cap.release()
-    cv2.destroyAllWindows()
+
+                        # HUD
+                        curr_time = time.time()
+                        fps = 1.0 / (curr_time - prev_time + 1e-9)
+                        prev_time = curr_time
+
+                        draw_hud(frame, visited, len(names), mode)
+                        draw_top_bar(frame, w, mode, fps)
+
+                        all_done = all(visited.values())
+                        draw_status_bar(frame, w, h, all_done, mode)
+
+                    else:
+                        # No body detected
+                        cv2.putText(frame, "Step into frame", (w // 2 - 100, h // 2 - 10),
+                                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, ACCENT_RED, 2, cv2.LINE_AA)
+                        cv2.putText(frame, "Ensure upper body is visible",
+                                    (w // 2 - 150, h // 2 + 25),
+                                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, DIM_WHITE, 1, cv2.LINE_AA)
+
+                        curr_time = time.time()
+                        fps = 1.0 / (curr_time - prev_time + 1e-9)
+                        prev_time = curr_time
+                        draw_top_bar(frame, w, mode, fps)
+
+                    cv2.imshow("Hand & Lung Alignment Tracker", frame)
+                    key = cv2.waitKey(1) & 0xFF
+                    buf.release(frame)
+                    if key == ord('q'):
+                        break
+                    elif key == ord('r'):
+                        visited = {k: False for k in visited}
+                    elif key == ord('m'):
+                        mode = "cardiac" if mode == "lung" else "lung"
+                        visited = new_checklist(mode)
+            finally:
+                # Stop feeding the graphs before the landmarkers are closed,
+                # however the loop was left
+                stop.set()
+                capture.join(timeout=1.0)
+    finally:
+        cap.release()
+        cv2.destroyAllWindows()
     print("[INFO] Tracker closed.")
 
 
 if __name__ == "__main__":
-    main()
+    args = parse_arguments()
+    main(hand_every=args.hand_every, opencl=not args.no_opencl)
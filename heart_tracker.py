@@ -10,24 +10,69 @@ Tracks hand position over the 5 standard cardiac auscultation points:
     4. Tricuspid    – 4th left intercostal space, left sternal border
     5. Mitral       – 5th left intercostal space, midclavicular line
 
-Usage:  python heart_tracker.py
+Usage:  python heart_tracker.py [--headless] [--display-fps N]
 Controls:  Q = quit   R = reset
 
+Environment:
+    HEART_TRACKER_THREADS   OpenMP/MKL threads for inference (default 2)
+    HEART_CV_THREADS        OpenCV worker threads (default 1)
+
 Dependencies:
     pip install opencv-python mediapipe numpy
+    pip install numba        # optional – JIT-compiles the per-frame geometry
+    pip install tqdm         # optional – progress bars for model downloads
 """
 
+import argparse
+import os
+
+# Thread budget, fixed before cv2 / mediapipe load their runtimes.  Two
+# inference threads is the sweet spot on laptop CPUs – more mostly adds
+# scheduling overhead and CPU load for the same throughput – and OpenCV
+# gets a single thread so it doesn't contend with MediaPipe and our own
+# capture/render threads.  Both can be overridden to sweep the settings.
+INFER_THREADS = os.environ.get("HEART_TRACKER_THREADS", "2")
+os.environ.setdefault("OMP_NUM_THREADS", INFER_THREADS)
+os.environ.setdefault("MKL_NUM_THREADS", INFER_THREADS)
+
+import concurrent.futures
 import cv2
 import numpy as np
+import functools
+import hashlib
+import itertools
 import math
 import time
-import os
+import queue
+import threading
+import urllib.error
 import urllib.request
 
 import mediapipe as mp
 from mediapipe.tasks import python as mp_python
 from mediapipe.tasks.python import vision
 
+from sprites import bake_bgra, blit_bgra, rings_sprite, rounded_rect
+from tracker_common import (HAND_SEG_IDX, SKEL_JOINT_IDX, SKEL_SEG_IDX,
+                            align_targets, landmarks_to_px, pick_delegate)
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional – fall back to plain Python with identical results
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
+
+cv2.setUseOptimized(True)
+cv2.setNumThreads(int(os.environ.get("HEART_CV_THREADS", "1")))
+
 # ─── Model Paths ──────────────────────────────────────────────────────────────
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -36,6 +81,29 @@ HAND_MODEL = os.path.join(SCRIPT_DIR, "hand_landmarker.task")
 POSE_URL = "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_lite/float16/latest/pose_landmarker_lite.task"
 HAND_URL = "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/latest/hand_landmarker.task"
 
+# int8 builds: roughly twice as fast on the CPU delegate, where float16
+# weights are just widened to float32 on load.  The GPU delegate runs
+# float16 natively, so it keeps the float16 files.
+POSE_MODEL_INT8 = os.path.join(SCRIPT_DIR, "pose_landmarker_int8.task")
+HAND_MODEL_INT8 = os.path.join(SCRIPT_DIR, "hand_landmarker_int8.task")
+POSE_URL_INT8 = "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_lite/int8/latest/pose_landmarker_lite.task"
+HAND_URL_INT8 = "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/int8/latest/hand_landmarker.task"
+
+# Pinned SHA-256 of each published file.  ensure_model() only accepts a
+# model that matches its pin; an entry left as None falls back to trusting
+# the first copy it sees (recorded in `<model>.sha256`).
+POSE_SHA256 = None
+HAND_SHA256 = None
+POSE_SHA256_INT8 = None
+HAND_SHA256_INT8 = None
+
+MODELS = {
+    "pose": {"int8": (POSE_MODEL_INT8, POSE_URL_INT8, POSE_SHA256_INT8),
+             "float16": (POSE_MODEL, POSE_URL, POSE_SHA256)},
+    "hand": {"int8": (HAND_MODEL_INT8, HAND_URL_INT8, HAND_SHA256_INT8),
+             "float16": (HAND_MODEL, HAND_URL, HAND_SHA256)},
+}
+
 # ─── Design Tokens ────────────────────────────────────────────────────────────
 
 # Cardiac-red palette
@@ -50,10 +118,26 @@ WHITE         = (255, 255, 255)
 DIM_WHITE     = (155, 155, 160)
 SKELETON_COL  = (80, 70, 65)
 HAND_COL      = (180, 140, 60)
+HAND_JOINT    = (230, 190, 70)
+PATH_COL      = (50, 40, 40)       # dashed exam path / sternum
 
 ALIGNMENT_RADIUS = 48
 POINT_R = 11
 
+# Both models resize internally to ~256 px, so they get a downscaled copy
+# of the frame; landmarks are normalised and map straight back onto the
+# full-resolution frame used for drawing.
+INFER_W = 640
+
+# The torso barely moves between frames at 30 fps, so pose runs on every
+# POSE_EVERY-th frame and the renderer reuses the last result in between.
+# Hands are the user's cursor and are detected on every frame.
+POSE_EVERY = 2
+
+# imshow can't show more than the monitor refreshes, so frames beyond this
+# rate are tracked (alignment, checklist) but not drawn.
+DISPLAY_FPS = 60
+
 # Label descriptions (matching HeartExam.jsx)
 POINT_DESCRIPTIONS = {
     "Aortic":    "2nd right intercostal",
@@ -62,51 +146,187 @@ POINT_DESCRIPTIONS = {
     "Tricuspid": "4th left intercostal",
     "Mitral":    "5th ICS, midclavicular",
 }
+CARDIAC_NAMES = tuple(POINT_DESCRIPTIONS)   # row order of cardiac_kernel()
 
-# ─── Utilities ────────────────────────────────────────────────────────────────
+# ─── Landmark Topology ────────────────────────────────────────────────────────
 
-def ensure_model(path, url):
-    if not os.path.isfile(path):
-        print(f"[INFO] Downloading {os.path.basename(path)} …")
-        urllib.request.urlretrieve(url, path)
-        print("[INFO] Done.")
+# L/R shoulder, L/R hip – the torso corners the cardiac sites hang off
+ANCHOR_IDX = (11, 12, 23, 24)
 
+# ─── Utilities ────────────────────────────────────────────────────────────────
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
 
-def px(lm, w, h):
-    return int(lm.x * w), int(lm.y * h)
 
+def ensure_model(path, url, sha256=None):
+    """Download the model unless a copy with the expected digest exists.
 
+    With a pinned `sha256` both an existing file and a fresh download must
+    match it.  Otherwise the SHA-256 of the first copy is kept next to it in
+    `<model>.sha256`, so a truncated or corrupted file is fetched again on
+    the next start.
+    """
+    digest_path = path + ".sha256"
+    if os.path.isfile(path):
+        digest = file_sha256(path)
+        if sha256 is not None:
+            expected = sha256
+        elif os.path.isfile(digest_path):
+            with open(digest_path) as f:
+                expected = f.read().strip()
+        else:
+            # Downloaded before digests were recorded – trust it from now on
+            expected = digest
+            with open(digest_path, "w") as f:
+                f.write(digest)
+        if digest == expected:
+            return
+        print(f"[INFO] {os.path.basename(path)} failed its checksum")
+
+    name = os.path.basename(path)
+    print(f"[INFO] Downloading {name} …")
+    digest = download(url, path, sha256)
+    with open(digest_path, "w") as f:
+        f.write(digest)
+    print(f"[INFO] {name} done.")
+
+
+def download(url, path, sha256=None, chunk_size=1 << 16):
+    """Stream url to path with progress output; returns the SHA-256.
+
+    Data goes to `<path>.part` first, so an interrupted download – or one
+    that doesn't match `sha256` – never ends up under the real name.
+    """
+    name = os.path.basename(path)
+    part = path + ".part"
+    digest = hashlib.sha256()
+    done = 0
+    bar = None
+    try:
+        with urllib.request.urlopen(url) as r, open(part, "wb") as f:
+            total = int(r.headers.get("Content-Length") or 0)
+            if tqdm is not None:
+                bar = tqdm(total=total or None, unit="B", unit_scale=True,
+                           desc=name)
+            last_pct = -10
+            while chunk := r.read(chunk_size):
+                f.write(chunk)
+                digest.update(chunk)
+                done += len(chunk)
+                if bar is not None:
+                    bar.update(len(chunk))
+                elif total and done * 100 // total >= last_pct + 10:
+                    last_pct = done * 100 // total
+                    print(f"[INFO] {name}: {last_pct}%")
+        if total and done != total:
+            raise OSError(f"{name}: got {done} of {total} bytes")
+        if sha256 is not None and digest.hexdigest() != sha256:
+            raise OSError(f"{name}: SHA-256 mismatch ({digest.hexdigest()})")
+    except BaseException:
+        if os.path.isfile(part):
+            os.remove(part)
+        raise
+    finally:
+        if bar is not None:
+            bar.close()
+    os.replace(part, path)
+    return digest.hexdigest()
+
+
+# After a failed int8 download, don't try again for this long
+MODEL_RETRY_S = 24 * 3600
+
+
+def fetch_model(kind, delegate):
+    """Path to the best `kind` model for `delegate`, downloading as needed.
+
+    The CPU delegate tries the int8 build first and falls back to float16
+    when no int8 checkpoint can be fetched.  A failed optional download
+    leaves a `<model>.unavailable` marker, so later starts (and offline
+    ones) go straight to the fallback until MODEL_RETRY_S has passed.
+    """
+    if delegate == mp_python.BaseOptions.Delegate.CPU:
+        precisions = ("int8", "float16")
+    else:
+        precisions = ("float16",)
+
+    for precision in precisions:
+        path, url, sha256 = MODELS[kind][precision]
+        marker = path + ".unavailable"
+        optional = precision != precisions[-1]
+        if (optional and not os.path.isfile(path) and os.path.isfile(marker)
+                and time.time() - os.path.getmtime(marker) < MODEL_RETRY_S):
+            continue
+        try:
+            ensure_model(path, url, sha256)
+            return path
+        except (urllib.error.URLError, OSError) as e:
+            print(f"[INFO] No {precision} {kind} model ({e})")
+            if optional:
+                with open(marker, "w") as f:
+                    f.write(f"{e}\n")
+    raise RuntimeError(f"Could not obtain a {kind} landmarker model")
+
+
+@njit(cache=True)
 def dist(a, b):
     return math.hypot(a[0] - b[0], a[1] - b[1])
 
 
+# ─── Sprites ──────────────────────────────────────────────────────────────────
+
+@functools.lru_cache(maxsize=None)
+def glow_sprite(radius, colour, layers, intensity):
+    """Glow rings around a circle of `radius`, centred in the sprite."""
+    rings = [(radius + i * 2, intensity * (i / layers) * 0.5)
+             for i in range(layers, 0, -1)]
+    return rings_sprite(radius + layers * 2 + 2, colour, rings)
+
+
+@functools.lru_cache(maxsize=None)
+def text_size(text, scale, thickness=1):
+    return cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)[0]
+
+
+@functools.lru_cache(maxsize=256)
+def text_sprite(text, scale, colour, thickness=1):
+    """Anti-aliased Hershey text baked once into a BGRA sprite.
+
+    Returns (sprite, (dx, dy)) where (dx, dy) is the sprite's top-left
+    relative to the putText origin.
+    """
+    (tw, th), base = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX,
+                                     scale, thickness)
+    pad = thickness + 2
+    org = (pad, pad + th)
+    sprite = bake_bgra((tw + 2 * pad, th + base + 2 * pad),
+                       lambda img: cv2.putText(img, text, org,
+                                               cv2.FONT_HERSHEY_SIMPLEX, scale,
+                                               colour, thickness, cv2.LINE_AA))
+    return sprite, (-pad, -pad - th)
+
+
+def blit_text(img, text, org, scale, colour, thickness=1):
+    """Drop-in for cv2.putText on strings that repeat every frame."""
+    sprite, (dx, dy) = text_sprite(text, scale, colour, thickness)
+    blit_bgra(img, sprite, (org[0] + dx, org[1] + dy))
+
+
 def glow(img, centre, radius, colour, layers=10, intensity=0.35):
     """Soft radial glow."""
-    overlay = img.copy()
-    for i in range(layers, 0, -1):
-        r = radius + i * 2
-        a = intensity * (i / layers) * 0.5
-        cv2.circle(overlay, centre, r, colour, 2, cv2.LINE_AA)
-        cv2.addWeighted(overlay, a, img, 1 - a, 0, img)
-        overlay = img.copy()
-
-
-def rounded_rect(img, pt1, pt2, colour, radius=12, thickness=-1, alpha=0.75):
-    overlay = img.copy()
-    x1, y1 = pt1
-    x2, y2 = pt2
-    cv2.rectangle(overlay, (x1 + radius, y1), (x2 - radius, y2), colour, thickness)
-    cv2.rectangle(overlay, (x1, y1 + radius), (x2, y2 - radius), colour, thickness)
-    cv2.ellipse(overlay, (x1 + radius, y1 + radius), (radius, radius), 180, 0, 90, colour, thickness)
-    cv2.ellipse(overlay, (x2 - radius, y1 + radius), (radius, radius), 270, 0, 90, colour, thickness)
-    cv2.ellipse(overlay, (x1 + radius, y2 - radius), (radius, radius),  90, 0, 90, colour, thickness)
-    cv2.ellipse(overlay, (x2 - radius, y2 - radius), (radius, radius),   0, 0, 90, colour, thickness)
-    cv2.addWeighted(overlay, alpha, img, 1 - alpha, 0, img)
+    c = radius + layers * 2 + 2
+    blit_bgra(img, glow_sprite(radius, colour, layers, intensity),
+              (centre[0] - c, centre[1] - c))
 
 
 # ─── Anatomy ──────────────────────────────────────────────────────────────────
 
-def compute_cardiac_points(plm, w, h):
+def compute_cardiac_points(pose_px):
     """
     5 standard cardiac auscultation sites derived from pose landmarks.
     The camera view is MIRRORED, so anatomical-left appears on screen-right
@@ -126,10 +346,23 @@ def compute_cardiac_points(plm, w, h):
       Tricuspid = person's LEFT sternal border   → screen RIGHT
       Mitral    = person's LEFT midclavicular    → screen RIGHT
     """
-    ls = px(plm[11], w, h)   # L_SHOULDER (screen-right in mirror)
-    rs = px(plm[12], w, h)   # R_SHOULDER (screen-left in mirror)
-    lh = px(plm[23], w, h)
-    rh = px(plm[24], w, h)
+    pos = cardiac_kernel(pose_px).tolist()
+    points = [
+        {"name": name, "pos": tuple(p), "desc": POINT_DESCRIPTIONS[name],
+         "order": i + 1}
+        for i, (name, p) in enumerate(zip(CARDIAC_NAMES, pos))
+    ]
+    anchors = tuple(map(tuple, pose_px[list(ANCHOR_IDX)].tolist()))
+    return points, anchors
+
+
+@njit(cache=True)
+def cardiac_kernel(pose_px):
+    """Pixel positions of the 5 sites as a (5, 2) array, in CARDIAC_NAMES order."""
+    ls = pose_px[11]   # L_SHOULDER (screen-right in mirror)
+    rs = pose_px[12]   # R_SHOULDER (screen-left in mirror)
+    lh = pose_px[23]
+    rh = pose_px[24]
 
     torso_h = int(((lh[1] - ls[1]) + (rh[1] - rs[1])) / 2)
     mid_x   = (ls[0] + rs[0]) // 2
@@ -152,82 +385,106 @@ def compute_cardiac_points(plm, w, h):
     # Person's right sternal border → mid_x minus stb (towards screen-left / rs)
     # Person's left sternal border  → mid_x plus stb  (towards screen-right / ls)
 
-    points = [
-        # ── Aortic: 2nd ICS, person's RIGHT sternal border ──
-        {"name": "Aortic",    "pos": (mid_x - stb, top_y + ics2),
-         "desc": POINT_DESCRIPTIONS["Aortic"],    "order": 1},
-
-        # ── Pulmonic: 2nd ICS, person's LEFT sternal border ──
-        {"name": "Pulmonic",  "pos": (mid_x + stb, top_y + ics2),
-         "desc": POINT_DESCRIPTIONS["Pulmonic"],  "order": 2},
-
-        # ── Erb's Point: 3rd ICS, person's LEFT sternal border ──
-        {"name": "Erb's Pt",  "pos": (mid_x + stb, top_y + ics3),
-         "desc": POINT_DESCRIPTIONS["Erb's Pt"],  "order": 3},
-
-        # ── Tricuspid: 4th ICS, person's LEFT sternal border ──
-        {"name": "Tricuspid", "pos": (mid_x + stb, top_y + ics4),
-         "desc": POINT_DESCRIPTIONS["Tricuspid"], "order": 4},
-
-        # ── Mitral (Apex): 5th ICS, person's LEFT midclavicular line ──
-        {"name": "Mitral",    "pos": (mid_x + mcl, top_y + ics5),
-         "desc": POINT_DESCRIPTIONS["Mitral"],    "order": 5},
-    ]
-
-    return points, (ls, rs, lh, rh)
+    out = np.empty((5, 2), np.int32)
+    # ── Aortic: 2nd ICS, person's RIGHT sternal border ──
+    out[0, 0] = mid_x - stb
+    out[0, 1] = top_y + ics2
+    # ── Pulmonic: 2nd ICS, person's LEFT sternal border ──
+    out[1, 0] = mid_x + stb
+    out[1, 1] = top_y + ics2
+    # ── Erb's Point: 3rd ICS, person's LEFT sternal border ──
+    out[2, 0] = mid_x + stb
+    out[2, 1] = top_y + ics3
+    # ── Tricuspid: 4th ICS, person's LEFT sternal border ──
+    out[3, 0] = mid_x + stb
+    out[3, 1] = top_y + ics4
+    # ── Mitral (Apex): 5th ICS, person's LEFT midclavicular line ──
+    out[4, 0] = mid_x + mcl
+    out[4, 1] = top_y + ics5
+    return out
+
+
+def warm_up_jit():
+    """Compile the kernels up front so the first frame doesn't stall."""
+    targets = cardiac_kernel(np.zeros((33, 2), np.int32))
+    align_targets(np.zeros((1, 2), np.int32), targets, 1)
+    dist(np.zeros(2), np.ones(2))
 
 
 # ─── Drawing ─────────────────────────────────────────────────────────────────
 
-def draw_heart_zone(frame, anchors, plm, w, h):
+def draw_heart_zone(frame, anchors):
     """Draw a subtle heart-shaped zone on the upper-left chest area."""
     ls, rs, lh, rh = anchors
 
-    # Torso overlay
+    # Torso overlay – blend only the torso's bounding box, not the whole frame
     pts = np.array([rs, ls, lh, rh], dtype=np.int32)
-    overlay = frame.copy()
-    cv2.fillPoly(overlay, [pts], (35, 25, 30))
-    cv2.addWeighted(overlay, 0.15, frame, 0.85, 0, frame)
+    h, w = frame.shape[:2]
+    x0, y0 = np.maximum(pts.min(axis=0), 0).tolist()
+    x1, y1 = np.minimum(pts.max(axis=0) + 1, (w, h)).tolist()
+    if x0 < x1 and y0 < y1:
+        roi = frame[y0:y1, x0:x1]
+        overlay = roi.copy()
+        cv2.fillPoly(overlay, [pts], (35, 25, 30), offset=(-x0, -y0))
+        cv2.addWeighted(overlay, 0.15, roi, 0.85, 0, roi)
     cv2.polylines(frame, [pts], True, (65, 55, 55), 1, cv2.LINE_AA)
 
     # Vertical sternum line
     mid_x = (ls[0] + rs[0]) // 2
     top_y = min(ls[1], rs[1])
     bot_y = max(lh[1], rh[1])
-    # Dashed sternum
+    # Dashed sternum, every dash in one polylines call
     seg = 8
-    for y in range(top_y, bot_y, seg * 2):
-        cv2.line(frame, (mid_x, y), (mid_x, min(y + seg, bot_y)),
-                 (50, 40, 40), 1, cv2.LINE_AA)
+    ys = np.arange(top_y, bot_y, seg * 2, dtype=np.int32)
+    if len(ys):
+        dashes = np.empty((len(ys), 2, 2), np.int32)
+        dashes[:, :, 0] = mid_x
+        dashes[:, 0, 1] = ys
+        dashes[:, 1, 1] = np.minimum(ys + seg, bot_y)
+        cv2.polylines(frame, dashes, False, PATH_COL, 1, cv2.LINE_AA)
 
 
-def draw_skeleton(frame, plm, w, h):
-    CONNS = [
-        (11,12),(11,13),(13,15),(12,14),(14,16),
-        (11,23),(12,24),(23,24),(23,25),(24,26),(25,27),(26,28),
-    ]
-    for a, b in CONNS:
-        cv2.line(frame, px(plm[a], w, h), px(plm[b], w, h),
-                 SKELETON_COL, 1, cv2.LINE_AA)
-    for i in [11,12,13,14,15,16,23,24,25,26,27,28]:
-        cv2.circle(frame, px(plm[i], w, h), 3, SKELETON_COL, -1, cv2.LINE_AA)
-
-
-def draw_hand(frame, hlm, w, h):
-    CONNS = [
-        (0,1),(1,2),(2,3),(3,4),(0,5),(5,6),(6,7),(7,8),
-        (5,9),(9,10),(10,11),(11,12),(9,13),(13,14),(14,15),(15,16),
-        (13,17),(17,18),(18,19),(19,20),(0,17),
-    ]
-    for a, b in CONNS:
-        cv2.line(frame, px(hlm[a], w, h), px(hlm[b], w, h),
-                 HAND_COL, 1, cv2.LINE_AA)
-    for i in range(21):
-        cv2.circle(frame, px(hlm[i], w, h), 2, (230, 190, 70), -1, cv2.LINE_AA)
+def draw_skeleton(frame, pose_px):
+    # Everything the joint loop touches is bound locally once
+    _circle, _AA, col = cv2.circle, cv2.LINE_AA, SKELETON_COL
+    cv2.polylines(frame, list(pose_px[SKEL_SEG_IDX]), False, col, 1, _AA)
+    for pt in pose_px[SKEL_JOINT_IDX].tolist():
+        _circle(frame, pt, 3, col, -1, _AA)
+
+
+def draw_hand(frame, hand_px):
+    _circle, _AA, col = cv2.circle, cv2.LINE_AA, HAND_JOINT
+    cv2.polylines(frame, list(hand_px[HAND_SEG_IDX]), False, HAND_COL, 1, _AA)
+    for pt in hand_px.tolist():
+        _circle(frame, pt, 2, col, -1, _AA)
+
+
+@functools.lru_cache(maxsize=None)
+def label_pill(label):
+    """Target name on its translucent pill, baked as one BGRA sprite.
+
+    The sprite's top-left sits at (text_x - 5, baseline_y - text_h - 2).
+    """
+    lw, lh_ = text_size(label, 0.36)
+    _, base = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.36, 1)
+
+    def render(img):
+        rounded_rect(img, (0, 0), (lw + 10, lh_ + 5), BG_PANEL, radius=5, alpha=0.72)
+        cv2.putText(img, label, (5, lh_ + 2),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.36, WHITE, 1, cv2.LINE_AA)
+
+    # Canvas also covers any descenders hanging below the pill
+    return bake_bgra((lw + 11, lh_ + 3 + max(3, base + 1)), render)
 
 
-def draw_cardiac_target(frame, t, aligned, visited, t_now, order_active):
-    """Draw a single cardiac point with order number, ring, and label."""
+def draw_cardiac_target(frame, t, aligned, visited, pulse_fast, breath,
+                        order_active):
+    """Draw a single cardiac point with order number, ring, and label.
+
+    `pulse_fast` and `breath` are the frame's |sin| animation phases.
+    """
+    # Runs once per target per frame, so skip the cv2.* attribute lookups
+    _circle, _AA = cv2.circle, cv2.LINE_AA
     pos = t["pos"]
     order = t["order"]
     cx, cy = pos
@@ -237,8 +494,8 @@ def draw_cardiac_target(frame, t, aligned, visited, t_now, order_active):
         r = POINT_R + 4
         glow(frame, pos, r, GREEN_OK, layers=8, intensity=0.4)
         # Pulsing ring
-        pulse = int(5 * abs(math.sin(t_now * 4)))
-        cv2.circle(frame, pos, r + 6 + pulse, GREEN_OK, 2, cv2.LINE_AA)
+        pulse = int(5 * pulse_fast)
+        _circle(frame, pos, r + 6 + pulse, GREEN_OK, 2, _AA)
     elif visited:
         col = GREEN_DIM
         r = POINT_R
@@ -247,75 +504,81 @@ def draw_cardiac_target(frame, t, aligned, visited, t_now, order_active):
         r = POINT_R
         # Subtle breathing for active target
         if order == order_active:
-            breath = int(3 * abs(math.sin(t_now * 2)))
-            cv2.circle(frame, pos, r + breath + 6, CARDIAC_RED, 1, cv2.LINE_AA)
+            grow = int(3 * breath)
+            _circle(frame, pos, r + grow + 6, CARDIAC_RED, 1, _AA)
 
     # Filled circle
-    cv2.circle(frame, pos, r, col, -1, cv2.LINE_AA)
-    cv2.circle(frame, pos, r + 1, WHITE, 1, cv2.LINE_AA)
+    _circle(frame, pos, r, col, -1, _AA)
+    _circle(frame, pos, r + 1, WHITE, 1, _AA)
 
     # Order number in the circle
     num_str = str(order)
-    (tw, th), _ = cv2.getTextSize(num_str, cv2.FONT_HERSHEY_SIMPLEX, 0.38, 1)
-    cv2.putText(frame, num_str, (cx - tw // 2, cy + th // 2),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.38, WHITE, 1, cv2.LINE_AA)
+    tw, th = text_size(num_str, 0.38)
+    blit_text(frame, num_str, (cx - tw // 2, cy + th // 2), 0.38, WHITE)
 
     # Crosshair ticks
-    cv2.line(frame, (cx - r - 5, cy), (cx - r - 1, cy), DIM_WHITE, 1, cv2.LINE_AA)
-    cv2.line(frame, (cx + r + 1, cy), (cx + r + 5, cy), DIM_WHITE, 1, cv2.LINE_AA)
-    cv2.line(frame, (cx, cy - r - 5), (cx, cy - r - 1), DIM_WHITE, 1, cv2.LINE_AA)
-    cv2.line(frame, (cx, cy + r + 1), (cx, cy + r + 5), DIM_WHITE, 1, cv2.LINE_AA)
+    ticks = np.array([[(cx - r - 5, cy), (cx - r - 1, cy)],
+                      [(cx + r + 1, cy), (cx + r + 5, cy)],
+                      [(cx, cy - r - 5), (cx, cy - r - 1)],
+                      [(cx, cy + r + 1), (cx, cy + r + 5)]], np.int32)
+    cv2.polylines(frame, ticks, False, DIM_WHITE, 1, _AA)
 
     # Label pill above
     label = t["name"]
-    (lw, lh_), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.36, 1)
+    lw, lh_ = text_size(label, 0.36)
     lx = cx - lw // 2
     ly = cy - r - 14
-    rounded_rect(frame, (lx - 5, ly - lh_ - 2), (lx + lw + 5, ly + 3),
-                 BG_PANEL, radius=5, alpha=0.72)
-    cv2.putText(frame, label, (lx, ly),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.36, WHITE, 1, cv2.LINE_AA)
+    blit_bgra(frame, label_pill(label), (lx - 5, ly - lh_ - 2))
 
     # Description below (only for active/aligned)
     if order == order_active or aligned:
         desc = t["desc"]
-        (dw, dh), _ = cv2.getTextSize(desc, cv2.FONT_HERSHEY_SIMPLEX, 0.28, 1)
+        dw, dh = text_size(desc, 0.28)
         dx = cx - dw // 2
         dy = cy + r + 16
-        cv2.putText(frame, desc, (dx, dy),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.28, DIM_WHITE, 1, cv2.LINE_AA)
+        blit_text(frame, desc, (dx, dy), 0.28, DIM_WHITE)
 
 
 def draw_connection_lines(frame, targets, visited_dict):
     """Draw faint lines connecting the 5 points in order (stethoscope path)."""
     ordered = sorted(targets, key=lambda t: t["order"])
+    seg_len = 6
+    dashes = []
     for i in range(len(ordered) - 1):
-        p1 = ordered[i]["pos"]
-        p2 = ordered[i + 1]["pos"]
-        # Dashed line
+        p1 = np.array(ordered[i]["pos"], dtype=np.float64)
+        p2 = np.array(ordered[i + 1]["pos"], dtype=np.float64)
+        # Dashed line: every dash of every pair goes out in one polylines call
         length = dist(p1, p2)
         if length < 1:
             continue
-        seg_len = 6
-        dx = (p2[0] - p1[0]) / length
-        dy = (p2[1] - p1[1]) / length
-        d = 0
-        while d < length:
-            s = d
-            e = min(d + seg_len, length)
-            sp = (int(p1[0] + dx * s), int(p1[1] + dy * s))
-            ep = (int(p1[0] + dx * e), int(p1[1] + dy * e))
-            cv2.line(frame, sp, ep, (50, 40, 40), 1, cv2.LINE_AA)
-            d += seg_len * 2
-
-
-def draw_hud(frame, visited, targets, fps, w, h, t_now):
-    """Right-side vertical HUD panel for cardiac exam."""
-    panel_w = 230
-    panel_h = 60 + len(targets) * 36 + 60
-    px1 = w - panel_w - 14
-    py1 = 50
-    px2 = w - 14
+        step = (p2 - p1) / length
+        s = np.arange(0, length, seg_len * 2)
+        e = np.minimum(s + seg_len, length)
+        dashes.append(np.stack([p1 + step * s[:, None],
+                                p1 + step * e[:, None]], axis=1))
+    if dashes:
+        cv2.polylines(frame, np.concatenate(dashes).astype(np.int32), False,
+                      PATH_COL, 1, cv2.LINE_AA)
+
+
+HUD_W = 230      # panel width; the panel sits 14 px in from the right edge
+HUD_TOP = 50
+
+
+def hud_height(n_points):
+    return 60 + n_points * 36 + 60
+
+
+def render_hud(frame, checklist):
+    """Paint the HUD panel with its top-left corner at (0, 0).
+
+    `checklist` is a tuple of (order, name, ok) rows in exam order.
+    """
+    panel_w = HUD_W
+    panel_h = hud_height(len(checklist))
+    px1 = 0
+    py1 = 0
+    px2 = panel_w
     py2 = py1 + panel_h
 
     rounded_rect(frame, (px1, py1), (px2, py2), BG_PANEL, radius=14, alpha=0.82)
@@ -329,11 +592,9 @@ def draw_hud(frame, visited, targets, fps, w, h, t_now):
              (50, 40, 45), 1, cv2.LINE_AA)
 
     # Points list
-    ordered = sorted(targets, key=lambda t: t["order"])
     y = py1 + 56
     done_count = 0
-    for t in ordered:
-        ok = visited.get(t["name"], False)
+    for order, name, ok in checklist:
         if ok:
             done_count += 1
 
@@ -341,14 +602,14 @@ def draw_hud(frame, visited, targets, fps, w, h, t_now):
         badge_col = GREEN_OK if ok else (60, 50, 55)
         cv2.circle(frame, (px1 + 26, y - 3), 10, badge_col, -1, cv2.LINE_AA)
         cv2.circle(frame, (px1 + 26, y - 3), 10, (80, 70, 70), 1, cv2.LINE_AA)
-        num = str(t["order"])
+        num = str(order)
         (nw, nh), _ = cv2.getTextSize(num, cv2.FONT_HERSHEY_SIMPLEX, 0.34, 1)
         cv2.putText(frame, num, (px1 + 26 - nw // 2, y - 3 + nh // 2),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.34, WHITE, 1, cv2.LINE_AA)
 
         # Label
         tcol = GREEN_OK if ok else DIM_WHITE
-        cv2.putText(frame, t["name"], (px1 + 42, y),
+        cv2.putText(frame, name, (px1 + 42, y),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.38, tcol, 1, cv2.LINE_AA)
 
         # Tick or empty
@@ -363,7 +624,7 @@ def draw_hud(frame, visited, targets, fps, w, h, t_now):
     bar_x1 = px1 + 14
     bar_x2 = px2 - 14
     bar_w = bar_x2 - bar_x1
-    progress = done_count / max(len(targets), 1)
+    progress = done_count / max(len(checklist), 1)
     fill_w = int(bar_w * progress)
 
     cv2.rectangle(frame, (bar_x1, bar_y), (bar_x2, bar_y + 8), (40, 35, 38), -1)
@@ -378,8 +639,27 @@ def draw_hud(frame, visited, targets, fps, w, h, t_now):
                 cv2.FONT_HERSHEY_SIMPLEX, 0.3, DIM_WHITE, 1, cv2.LINE_AA)
 
 
-def draw_top_bar(frame, w, fps):
-    """Top status bar – cardiac themed."""
+@functools.lru_cache(maxsize=64)
+def hud_sprite(checklist):
+    """Whole HUD for one checklist state – at most 2**5 of them exist.
+
+    The sprite runs on to the frame's right edge so the percentage text
+    beyond the panel is clipped exactly as before.
+    """
+    size = (HUD_W + 14, hud_height(len(checklist)) + 1)
+    return bake_bgra(size, lambda img: render_hud(img, checklist))
+
+
+def draw_hud(frame, visited, targets, w):
+    """Right-side vertical HUD panel for cardiac exam."""
+    ordered = sorted(targets, key=lambda t: t["order"])
+    checklist = tuple((t["order"], t["name"], visited.get(t["name"], False))
+                      for t in ordered)
+    blit_bgra(frame, hud_sprite(checklist), (w - HUD_W - 14, HUD_TOP))
+
+
+def render_top_bar(frame, w):
+    """Static part of the top bar: background, icon, title and controls."""
     overlay = frame.copy()
     cv2.rectangle(overlay, (0, 0), (w, 38), BG_PANEL, -1)
     cv2.addWeighted(overlay, 0.75, frame, 0.25, 0, frame)
@@ -394,174 +674,402 @@ def draw_top_bar(frame, w, fps):
     cv2.putText(frame, "Q:Quit  R:Reset", (w - 140, 26),
                 cv2.FONT_HERSHEY_SIMPLEX, 0.34, (100, 100, 105), 1, cv2.LINE_AA)
 
-    # FPS
+
+@functools.lru_cache(maxsize=4)
+def top_bar_sprite(w):
+    return bake_bgra((w, 39), lambda img: render_top_bar(img, w))
+
+
+def draw_top_bar(frame, w, fps):
+    """Top status bar – cardiac themed."""
+    blit_bgra(frame, top_bar_sprite(w), (0, 0))
+
+    # FPS is the only part that changes from frame to frame
     cv2.putText(frame, f"FPS {int(fps)}", (w - 240, 26),
                 cv2.FONT_HERSHEY_SIMPLEX, 0.34, DIM_WHITE, 1, cv2.LINE_AA)
 
 
-def draw_bottom_bar(frame, w, h, all_done, t_now):
-    """Bottom status bar."""
-    bar_h = 42
+BOTTOM_BAR_H = 42
+
+
+def render_bottom_bar(frame, w, with_hint):
+    """Bottom bar background, plus the static hint text if requested."""
+    h = BOTTOM_BAR_H
     overlay = frame.copy()
-    cv2.rectangle(overlay, (0, h - bar_h), (w, h), BG_PANEL, -1)
+    cv2.rectangle(overlay, (0, 0), (w, h), BG_PANEL, -1)
     cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
 
-    if all_done:
-        # Celebration
-        pulse = 0.55 + 0.03 * math.sin(t_now * 3)
-        cv2.putText(frame, "ALL 5 CARDIAC POINTS CHECKED", (w // 2 - 200, h - 14),
-                    cv2.FONT_HERSHEY_SIMPLEX, pulse, GREEN_OK, 2, cv2.LINE_AA)
-    else:
+    if with_hint:
         cv2.putText(frame, "Place stethoscope/hand on each numbered cardiac point",
                     (w // 2 - 230, h - 16),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.44, DIM_WHITE, 1, cv2.LINE_AA)
 
 
-# ─── Main ─────────────────────────────────────────────────────────────────────
+@functools.lru_cache(maxsize=4)
+def bottom_bar_sprite(w, with_hint):
+    return bake_bgra((w, BOTTOM_BAR_H),
+                     lambda img: render_bottom_bar(img, w, with_hint))
 
-def main():
-    ensure_model(POSE_MODEL, POSE_URL)
-    ensure_model(HAND_MODEL, HAND_URL)
 
-    BaseOptions = mp_python.BaseOptions
+def draw_bottom_bar(frame, w, h, all_done, celeb):
+    """Bottom status bar; `celeb` is the frame's sin phase for the banner."""
+    blit_bgra(frame, bottom_bar_sprite(w, not all_done), (0, h - BOTTOM_BAR_H))
 
-    pose_opts = vision.PoseLandmarkerOptions(
-        base_options=BaseOptions(model_asset_path=POSE_MODEL),
-        running_mode=vision.RunningMode.VIDEO,
-        num_poses=1,
-        min_pose_detection_confidence=0.5,
-        min_pose_presence_confidence=0.5,
-        min_tracking_confidence=0.5,
-    )
-    hand_opts = vision.HandLandmarkerOptions(
-        base_options=BaseOptions(model_asset_path=HAND_MODEL),
-        running_mode=vision.RunningMode.VIDEO,
-        num_hands=2,
-        min_hand_detection_confidence=0.5,
-        min_hand_presence_confidence=0.5,
-        min_tracking_confidence=0.5,
-    )
+    if all_done:
+        # Celebration – animated, so drawn fresh every frame
+        pulse = 0.55 + 0.03 * celeb
+        cv2.putText(frame, "ALL 5 CARDIAC POINTS CHECKED", (w // 2 - 200, h - 14),
+                    cv2.FONT_HERSHEY_SIMPLEX, pulse, GREEN_OK, 2, cv2.LINE_AA)
 
-    cap = cv2.VideoCapture(0)
-    if not cap.isOpened():
-        print("[ERROR] Cannot open webcam.")
-        return
 
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+# ─── Pipeline Stages ──────────────────────────────────────────────────────────
+#
+#  capture thread ──detect_async──▶ MediaPipe graphs ──callbacks──▶ LatestResults
+#        └──────────frame_q──────────▶ render (main thread)
+#
+#  frame_q is bounded, so a slow renderer blocks capture instead of letting
+#  stale frames pile up.  None is the end-of-stream sentinel.
 
-    visited = {}
-    prev_time = time.time()
+QUEUE_SIZE = 2
 
-    with vision.PoseLandmarker.create_from_options(pose_opts) as pose_lm, \
-         vision.HandLandmarker.create_from_options(hand_opts) as hand_lm:
 
-        frame_idx = 0
+class LatestResults:
+    """Most recent pose / hand results, written by the landmarker callbacks.
 
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
+    The renderer draws each frame with whatever results have arrived, i.e.
+    up to a frame stale, in exchange for never waiting on inference.
+    """
 
-            frame = cv2.flip(frame, 1)
-            h, w, _ = frame.shape
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pose = None
+        self.hand = None
 
-            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
-            frame_idx += 1
-            ts = int(frame_idx * (1000 / 30))
+    def on_pose(self, result, output_image, timestamp_ms):
+        with self.lock:
+            self.pose = result
 
-            pose_res = pose_lm.detect_for_video(mp_image, ts)
-            hand_res = hand_lm.detect_for_video(mp_image, ts)
+    def on_hand(self, result, output_image, timestamp_ms):
+        with self.lock:
+            self.hand = result
 
-            t_now = time.time()
+    def get(self):
+        with self.lock:
+            return self.pose, self.hand
 
-            if pose_res.pose_landmarks and len(pose_res.pose_landmarks) > 0:
-                plm = pose_res.pose_landmarks[0]
+    def clear(self):
+        with self.lock:
+            self.pose = self.hand = None
 
-                draw_skeleton(frame, plm, w, h)
 
-                targets, anchors = compute_cardiac_points(plm, w, h)
-                draw_heart_zone(frame, anchors, plm, w, h)
+def put_until_stopped(q, item, stop):
+    """Blocking put that gives up once `stop` is set."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
 
-                # Ensure visited dict
-                for t in targets:
-                    if t["name"] not in visited:
-                        visited[t["name"]] = False
 
-                # Determine next active target (first unvisited in order)
-                order_active = 0
-                for t in sorted(targets, key=lambda x: x["order"]):
-                    if not visited.get(t["name"], False):
-                        order_active = t["order"]
-                        break
+def capture_worker(cap, pose_lm, hand_lm, frame_q, stop, frame_counter):
+    """Grab and mirror frames, feed both landmarkers, hand frames to render.
 
-                # Draw connecting path
-                draw_connection_lines(frame, targets, visited)
+    `frame_counter` outlives a single run, so timestamps keep increasing
+    when the same landmarkers are fed again after a restart.
+    """
+    # Preallocated outputs for flip / resize / cvtColor.  mp.Image copies
+    # its input, so single inference buffers suffice; mirrored frames are
+    # handed to the renderer, so they rotate through a ring of
+    # QUEUE_SIZE + 2 (queued frames, the one being drawn, the one being
+    # filled) and are never overwritten while still in use.
+    flip_bufs = None
+    small_buf = None
+    rgb_buf = None
+    while not stop.is_set():
+        ret, raw = cap.read()
+        if not ret:
+            break
+
+        if flip_bufs is None:
+            h, w = raw.shape[:2]
+            infer_size = (INFER_W, round(h * INFER_W / w))
+            flip_bufs = [np.empty_like(raw) for _ in range(QUEUE_SIZE + 2)]
+            small_buf = np.empty((infer_size[1], infer_size[0], 3), np.uint8)
+            rgb_buf = np.empty_like(small_buf)
+
+        frame_idx = next(frame_counter)
+        frame = cv2.flip(raw, 1, dst=flip_bufs[frame_idx % len(flip_bufs)])
+        cv2.resize(frame, infer_size, dst=small_buf, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(small_buf, cv2.COLOR_BGR2RGB, dst=rgb_buf)
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_buf)
+        ts = int(frame_idx * (1000 / 30))
+
+        if frame_idx % POSE_EVERY == 0:
+            pose_lm.detect_async(mp_image, ts)
+        hand_lm.detect_async(mp_image, ts)
+
+        if not put_until_stopped(frame_q, frame, stop):
+            return
+    put_until_stopped(frame_q, None, stop)
+
+
+# ─── Tracker ──────────────────────────────────────────────────────────────────
+
+class HeartTracker:
+    """Owns the two landmarkers so they are built once and reused.
+
+    Creating MediaPipe graphs takes 0.5-2 s and leaks memory if repeated,
+    so run() can be called any number of times on one instance.
+    """
 
-                # Hand positions
-                hand_positions = []
-                if hand_res.hand_landmarks:
-                    for hlm in hand_res.hand_landmarks:
-                        draw_hand(frame, hlm, w, h)
-                        hc = px(hlm[9], w, h)
-                        hand_positions.append(hc)
+    def __init__(self, pose_model=POSE_MODEL, hand_model=HAND_MODEL,
+                 delegate=None):
+        self.pose_model = pose_model
+        self.hand_model = hand_model
+        self.delegate = delegate or mp_python.BaseOptions.Delegate.CPU
+        self.latest = LatestResults()
+        self.frame_counter = itertools.count(1)
+        self.pose_lm = None
+        self.hand_lm = None
+
+    def __enter__(self):
+        return self.preload()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def preload(self):
+        """Build both landmarkers now instead of on the first run()."""
+        if self.pose_lm is not None:
+            return self
+
+        BaseOptions = mp_python.BaseOptions
+        pose_opts = vision.PoseLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=self.pose_model,
+                                     delegate=self.delegate),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_poses=1,
+            min_pose_detection_confidence=0.5,
+            min_pose_presence_confidence=0.5,
+            min_tracking_confidence=0.5,
+            result_callback=self.latest.on_pose,
+        )
+        hand_opts = vision.HandLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=self.hand_model,
+                                     delegate=self.delegate),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_hands=2,
+            min_hand_detection_confidence=0.5,
+            min_hand_presence_confidence=0.5,
+            min_tracking_confidence=0.5,
+            result_callback=self.latest.on_hand,
+        )
+        self.pose_lm = vision.PoseLandmarker.create_from_options(pose_opts)
+        self.hand_lm = vision.HandLandmarker.create_from_options(hand_opts)
+        return self
+
+    def close(self):
+        for lm in (self.pose_lm, self.hand_lm):
+            if lm is not None:
+                lm.close()
+        self.pose_lm = self.hand_lm = None
+
+    def run(self, headless=False, display_fps=DISPLAY_FPS):
+        """Track from the webcam until the stream ends or Q is pressed.
+
+        Every frame updates the checklist, but the overlay is only drawn
+        and shown at up to `display_fps`.  `headless` never draws or opens
+        a window and logs throughput instead; stop it with Ctrl+C.
+        """
+        self.preload()
+        self.latest.clear()
+
+        cap = cv2.VideoCapture(0)
+        if not cap.isOpened():
+            print("[ERROR] Cannot open webcam.")
+            return
+
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+
+        visited = {}
+        prev_time = time.time()
+        last_show = 0.0
+        min_show_dt = 1.0 / display_fps
+        log_time, log_frames = prev_time, 0
+
+        stop = threading.Event()
+        capture = None
+        try:
+            frame_q = queue.Queue(maxsize=QUEUE_SIZE)
+            capture = threading.Thread(target=capture_worker,
+                                       args=(cap, self.pose_lm, self.hand_lm,
+                                             frame_q, stop, self.frame_counter),
+                                       daemon=True)
+            capture.start()
+
+            while True:
+                try:
+                    frame = frame_q.get()
+                except KeyboardInterrupt:
+                    break
+                if frame is None:
+                    break
+
+                pose_res, hand_res = self.latest.get()
+                h, w, _ = frame.shape
+                t_now = time.time()
+                curr_time = t_now
+                fps = 1.0 / (curr_time - prev_time + 1e-9)
+                prev_time = curr_time
 
-                # Check alignment & draw each target
-                for t in targets:
-                    aligned = False
-                    for hp in hand_positions:
-                        if dist(hp, t["pos"]) < ALIGNMENT_RADIUS:
-                            aligned = True
-                            visited[t["name"]] = True
+                show = not headless and t_now - last_show >= min_show_dt
+                if headless:
+                    log_frames += 1
+                    if t_now - log_time >= 2.0:
+                        print(f"[INFO] {log_frames / (t_now - log_time):.1f} fps")
+                        log_time, log_frames = t_now, 0
+
+                if pose_res is not None and pose_res.pose_landmarks:
+                    # Landmark -> pixel conversion happens once per frame
+                    pose_px = landmarks_to_px(pose_res.pose_landmarks[0], w, h)
+                    targets, anchors = compute_cardiac_points(pose_px)
+
+                    # Ensure visited dict
+                    for t in targets:
+                        if t["name"] not in visited:
+                            visited[t["name"]] = False
+
+                    # Determine next active target (first unvisited in order)
+                    order_active = 0
+                    for t in sorted(targets, key=lambda x: x["order"]):
+                        if not visited.get(t["name"], False):
+                            order_active = t["order"]
                             break
 
-                    draw_cardiac_target(frame, t, aligned,
-                                        visited.get(t["name"], False),
-                                        t_now, order_active)
+                    # Hand positions
+                    hands_px = []
+                    if hand_res is not None and hand_res.hand_landmarks:
+                        hands_px = [landmarks_to_px(hlm, w, h)
+                                    for hlm in hand_res.hand_landmarks]
+                    hand_positions = [tuple(hp[9].tolist()) for hp in hands_px]
+
+                    # Nearest hand and alignment for every target in one kernel
+                    hands = np.array(hand_positions, dtype=np.int32).reshape(-1, 2)
+                    target_pos = np.array([t["pos"] for t in targets], dtype=np.int32)
+                    aligned_mask, nearest_hand = align_targets(
+                        hands, target_pos, ALIGNMENT_RADIUS * ALIGNMENT_RADIUS)
+                    for i, t in enumerate(targets):
+                        if aligned_mask[i]:
+                            visited[t["name"]] = True
 
-                    if aligned:
-                        for hp in hand_positions:
-                            if dist(hp, t["pos"]) < ALIGNMENT_RADIUS:
-                                cv2.line(frame, hp, t["pos"],
-                                         GREEN_OK, 2, cv2.LINE_AA)
-                                break
+                    if show:
+                        # Animation phases, evaluated once per frame for all targets
+                        pulse_fast = abs(math.sin(t_now * 4))
+                        breath = abs(math.sin(t_now * 2))
+                        celeb = math.sin(t_now * 3)
+
+                        draw_skeleton(frame, pose_px)
+                        draw_heart_zone(frame, anchors)
+
+                        # Draw connecting path
+                        draw_connection_lines(frame, targets, visited)
+                        for hand_px in hands_px:
+                            draw_hand(frame, hand_px)
+
+                        # Draw each target
+                        for i, t in enumerate(targets):
+                            aligned = bool(aligned_mask[i])
+                            draw_cardiac_target(frame, t, aligned, visited[t["name"]],
+                                                pulse_fast, breath, order_active)
+                            if aligned:
+                                hp = hand_positions[nearest_hand[i]]
+                                cv2.line(frame, hp, t["pos"], GREEN_OK, 2, cv2.LINE_AA)
+
+                        # HUD
+                        draw_hud(frame, visited, targets, w)
+                        draw_top_bar(frame, w, fps)
+
+                        all_done = all(visited.values()) if visited else False
+                        draw_bottom_bar(frame, w, h, all_done, celeb)
+
+                elif show:
+                    # No body
+                    blit_text(frame, "Step into frame", (w // 2 - 100, h // 2 - 10),
+                              0.8, CARDIAC_RED, 2)
+                    blit_text(frame, "Ensure upper body is visible",
+                              (w // 2 - 145, h // 2 + 25), 0.48, DIM_WHITE)
+                    draw_top_bar(frame, w, fps)
+
+                if not show:
+                    continue
+                last_show = t_now
+
+                cv2.imshow("Heart Placement Tracker", frame)
+                key = cv2.waitKey(1) & 0xFF
+                if key == ord('q'):
+                    break
+                elif key == ord('r'):
+                    visited = {k: False for k in visited}
+        finally:
+            # Stop feeding the graphs before close() shuts the landmarkers,
+            # however the loop was left
+            stop.set()
+            if capture is not None:
+                capture.join(timeout=1.0)
+            cap.release()
+
+        if not headless:
+            cv2.destroyAllWindows()
 
-                # HUD
-                curr_time = time.time()
-                fps = 1.0 / (curr_time - prev_time + 1e-9)
-                prev_time = curr_time
 
-                draw_hud(frame, visited, targets, fps, w, h, t_now)
-                draw_top_bar(frame, w, fps)
+# ─── Main ─────────────────────────────────────────────────────────────────────
 
-                all_done = all(visited.values()) if visited else False
-                draw_bottom_bar(frame, w, h, all_done, t_now)
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Heart Auscultation Placement Tracker"
+    )
 
-            else:
-                # No body
-                curr_time = time.time()
-                fps = 1.0 / (curr_time - prev_time + 1e-9)
-                prev_time = curr_time
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Track without drawing or opening a window and log FPS "
+             "(for benchmarking inference throughput)"
+    )
+
+    parser.add_argument(
+        "--display-fps",
+        type=float,
+        default=DISPLAY_FPS,
+        help=f"Maximum rate at which the overlay is drawn and shown "
+             f"(default: {DISPLAY_FPS})"
+    )
+
+    args = parser.parse_args()
+    if not args.display_fps > 0:
+        parser.error("--display-fps must be greater than 0")
+    return args
+
+
+def main(headless=False, display_fps=DISPLAY_FPS):
+    # The float16 pose model doubles as the GPU probe and the CPU fallback
+    ensure_model(POSE_MODEL, POSE_URL, POSE_SHA256)
+    delegate = pick_delegate(POSE_MODEL)
+    # The two downloads are independent, so they run side by side
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+        pose_model, hand_model = pool.map(lambda kind: fetch_model(kind, delegate),
+                                          ("pose", "hand"))
+    warm_up_jit()
+
+    with HeartTracker(pose_model, hand_model, delegate) as tracker:
+        tracker.run(headless=headless, display_fps=display_fps)
 
-                cv2.putText(frame, "Step into frame", (w // 2 - 100, h // 2 - 10),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.8, CARDIAC_RED, 2, cv2.LINE_AA)
-                cv2.putText(frame, "Ensure upper body is visible",
-                            (w // 2 - 145, h // 2 + 25),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.48, DIM_WHITE, 1, cv2.LINE_AA)
-                draw_top_bar(frame, w, fps)
-
-            cv2.imshow("Heart Placement Tracker", frame)
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q'):
-                break
-            elif key == ord('r'):
-                visited = {k: False for k in visited}
-
-    cap.release()
-    cv2.destroyAllWindows()
     print("[INFO] Heart tracker closed.")
 
 
 if __name__ == "__main__":
-    main()
+    args = parse_arguments()
+    main(headless=args.headless, display_fps=args.display_fps)
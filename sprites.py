@@ -0,0 +1,109 @@
+"""
+BGRA Sprite Helpers
+===================
+Shared by hand_lung_tracker.py, heart_tracker.py and tracker_server.py.
+
+Translucent overlays are rendered once into small BGRA sprites (usually
+cached by the caller), then alpha-blended into just the pixels they cover
+instead of a full-frame copy + addWeighted per shape.  Besides the blend
+and bake helpers this holds the shapes more than one tracker draws:
+rounded panels and glow rings.
+
+Dependencies:
+    pip install opencv-python numpy
+"""
+
+import cv2
+import functools
+import numpy as np
+
+
+def blit_bgra(img, sprite, origin):
+    """Alpha-blend a BGRA sprite onto img with its top-left at origin.
+
+    Only the sprite's bounding box is touched, blended in place with
+    saturating uint8 ops – no float temporaries the size of the ROI.
+    """
+    x, y = origin
+    sh, sw = sprite.shape[:2]
+    ih, iw = img.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + sw, iw), min(y + sh, ih)
+    if x0 >= x1 or y0 >= y1:
+        return
+    spr = sprite[y0 - y:y1 - y, x0 - x:x1 - x]
+    roi = img[y0:y1, x0:x1]
+    a = cv2.cvtColor(spr[..., 3], cv2.COLOR_GRAY2BGR)
+    cv2.multiply(roi, 255 - a, dst=roi, scale=1 / 255)
+    cv2.add(roi, cv2.multiply(spr[..., :3], a, scale=1 / 255), dst=roi)
+
+
+def bake_bgra(size, draw):
+    """Capture whatever draw(canvas) paints as a (w, h) BGRA sprite.
+
+    Every OpenCV draw/blend is linear in the pixels underneath, so painting
+    once over black and once over white pins down each pixel's coverage
+    and colour exactly – existing draw code can be baked unchanged.
+    """
+    w, h = size
+    black = np.zeros((h, w, 3), np.uint8)
+    white = np.full((h, w, 3), 255, np.uint8)
+    draw(black)
+    draw(white)
+
+    b = black.astype(np.float32)
+    a = 1 - (white.astype(np.float32) - b).mean(axis=2, keepdims=True) / 255
+    a = np.clip(a, 0, 1)
+
+    sprite = np.empty((h, w, 4), np.uint8)
+    sprite[..., :3] = np.clip(np.rint(b / np.maximum(a, 1e-6)), 0, 255)
+    sprite[..., 3:] = np.rint(a * 255)
+    return sprite
+
+
+def rings_sprite(c, colour, rings):
+    """2 px rings of `colour` centred at (c, c) of a (2c + 1)² BGRA sprite.
+
+    `rings` is a sequence of (radius, alpha) pairs, outermost first; they
+    are composited in that order, exactly as if each one were blended onto
+    the frame in turn.
+    """
+    ring = np.zeros((2 * c + 1, 2 * c + 1), np.uint8)
+    alpha = np.zeros(ring.shape, np.float32)
+    for r, a in rings:
+        ring[:] = 0
+        cv2.circle(ring, (c, c), r, 255, 2, cv2.LINE_AA)
+        cover = ring * (a / 255)
+        alpha = cover + (1 - cover) * alpha
+
+    sprite = np.empty(ring.shape + (4,), np.uint8)
+    sprite[..., :3] = colour
+    sprite[..., 3] = np.rint(alpha * 255)
+    return sprite
+
+
+@functools.lru_cache(maxsize=128)
+def rounded_rect_sprite(w, h, colour, radius, thickness, alpha):
+    """Rounded rectangle spanning (0, 0)–(w, h) with uniform transparency."""
+    mask = np.zeros((h + 1, w + 1), np.uint8)
+    # Main body
+    cv2.rectangle(mask, (radius, 0), (w - radius, h), 255, thickness)
+    cv2.rectangle(mask, (0, radius), (w, h - radius), 255, thickness)
+    # Corners
+    cv2.ellipse(mask, (radius, radius), (radius, radius), 180, 0, 90, 255, thickness)
+    cv2.ellipse(mask, (w - radius, radius), (radius, radius), 270, 0, 90, 255, thickness)
+    cv2.ellipse(mask, (radius, h - radius), (radius, radius),  90, 0, 90, 255, thickness)
+    cv2.ellipse(mask, (w - radius, h - radius), (radius, radius),   0, 0, 90, 255, thickness)
+
+    sprite = np.empty(mask.shape + (4,), np.uint8)
+    sprite[..., :3] = colour
+    sprite[..., 3] = np.rint(mask * alpha)
+    return sprite
+
+
+def rounded_rect(img, pt1, pt2, colour, radius=12, thickness=-1, alpha=0.75):
+    """Draw a rounded rectangle with transparency."""
+    x1, y1 = pt1
+    x2, y2 = pt2
+    sprite = rounded_rect_sprite(x2 - x1, y2 - y1, colour, radius, thickness, alpha)
+    blit_bgra(img, sprite, (x1, y1))
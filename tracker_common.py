@@ -0,0 +1,98 @@
+"""
+Shared Tracker Helpers
+======================
+Landmark topology, landmark-to-pixel conversion, hand/target alignment and
+the MediaPipe delegate probe used by hand_lung_tracker.py, heart_tracker.py
+and tracker_server.py.
+
+Dependencies:
+    pip install mediapipe numpy
+    pip install numba        # optional – JIT-compiles align_targets()
+"""
+
+import numpy as np
+
+from mediapipe.tasks import python as mp_python
+from mediapipe.tasks.python import vision
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional – fall back to plain Python with identical results
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+# ─── Landmark Topology ────────────────────────────────────────────────────────
+
+# Bone segments as landmark index pairs; indexing a (N, 2) pixel array with
+# these yields (K, 2, 2) segments that cv2.polylines draws in a single call.
+SKEL_SEG_IDX = np.array([
+    (11,12),(11,13),(13,15),(12,14),(14,16),
+    (11,23),(12,24),(23,24),(23,25),(24,26),(25,27),(26,28),
+], dtype=np.int32)
+SKEL_JOINT_IDX = np.array([11,12,13,14,15,16,23,24,25,26,27,28], dtype=np.int32)
+
+HAND_SEG_IDX = np.array([
+    (0,1),(1,2),(2,3),(3,4),(0,5),(5,6),(6,7),(7,8),
+    (5,9),(9,10),(10,11),(11,12),(9,13),(13,14),(14,15),(15,16),
+    (13,17),(17,18),(18,19),(19,20),(0,17),
+], dtype=np.int32)
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+def landmarks_to_px(lms, w, h):
+    """Pixel coords for a whole landmark list as one (N, 2) int32 array."""
+    arr = np.fromiter((v for lm in lms for v in (lm.x, lm.y)),
+                      dtype=np.float32, count=len(lms) * 2).reshape(-1, 2)
+    arr *= (w, h)
+    return arr.astype(np.int32)
+
+
+@njit(cache=True)
+def align_targets(hands, targets, r2):
+    """Per target: is any hand within sqrt(r2), and which hand is nearest.
+
+    Works purely on squared integer distances – no sqrt on the hot path.
+    """
+    n = targets.shape[0]
+    aligned = np.zeros(n, np.bool_)
+    nearest = np.zeros(n, np.int64)
+    for i in range(n):
+        best = -1
+        best_d2 = 0
+        for j in range(hands.shape[0]):
+            dx = hands[j, 0] - targets[i, 0]
+            dy = hands[j, 1] - targets[i, 1]
+            d2 = dx * dx + dy * dy
+            if best < 0 or d2 < best_d2:
+                best = j
+                best_d2 = d2
+        if best >= 0:
+            nearest[i] = best
+            aligned[i] = best_d2 < r2
+    return aligned, nearest
+
+
+def pick_delegate(model_path):
+    """Return the GPU delegate if MediaPipe can build a graph on it, else CPU.
+
+    GPU support depends on the platform's OpenGL ES stack (flaky on
+    Windows/WSL, usually missing on headless servers), so a throwaway
+    landmarker is created as a probe.
+    """
+    BaseOptions = mp_python.BaseOptions
+    try:
+        probe = vision.PoseLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=model_path,
+                                     delegate=BaseOptions.Delegate.GPU),
+            running_mode=vision.RunningMode.IMAGE,
+        )
+        with vision.PoseLandmarker.create_from_options(probe):
+            pass
+    except Exception as e:
+        print(f"[INFO] MediaPipe GPU delegate unavailable ({e}) – using CPU")
+        return BaseOptions.Delegate.CPU
+    print("[INFO] MediaPipe GPU delegate enabled")
+    return BaseOptions.Delegate.GPU
@@ -15,13 +15,18 @@ Port: 5050
 
 Dependencies:
     pip install flask opencv-python mediapipe numpy
+    pip install simplejpeg   # optional – faster libjpeg-turbo JPEG encoding
+    pip install orjson       # optional – faster /status serialisation
 """
 
 import cv2
 import numpy as np
+import functools
+import json
 import math
 import time
 import os
+import queue
 import threading
 import urllib.request
 
@@ -31,6 +36,19 @@ import mediapipe as mp
 from mediapipe.tasks import python as mp_python
 from mediapipe.tasks.python import vision
 
+from sprites import bake_bgra, blit_bgra
+from tracker_common import pick_delegate
+
+try:
+    import simplejpeg
+except ImportError:
+    simplejpeg = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ─── Configuration ────────────────────────────────────────────────────────────
 
 PORT = 5050
@@ -40,9 +58,27 @@ HAND_MODEL = os.path.join(SCRIPT_DIR, "hand_landmarker.task")
 POSE_URL = "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_lite/float16/latest/pose_landmarker_lite.task"
 HAND_URL = "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/latest/hand_landmarker.task"
 
+# On the GPU delegate there is headroom for the more accurate full pose model
+POSE_MODEL_FULL = os.path.join(SCRIPT_DIR, "pose_landmarker_full.task")
+POSE_URL_FULL = "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_full/float16/latest/pose_landmarker_full.task"
+
 # Streaming resolution (lower = faster FPS)
 STREAM_W = 640
 STREAM_H = 480
+CAMERA_FPS = 30
+
+# JPEG quality for the stream.  With 4:2:0 chroma subsampling, 55 looks the
+# same as 65 for this UI while producing noticeably fewer bytes to encode
+# and send.
+STREAM_QUALITY = 55
+
+# Inference resolution, independent of the stream size: the long side is
+# INFER_SIZE px (the pose landmarker's own 256 px input), the aspect ratio is
+# kept so MediaPipe's letterboxing sees undistorted bodies.  Landmarks come
+# back normalised to [0, 1], so they map straight onto the stream frame.
+INFER_SIZE = 256
+DETECT_W = INFER_SIZE
+DETECT_H = INFER_SIZE * STREAM_H // STREAM_W
 
 # ─── Design Tokens ────────────────────────────────────────────────────────────
 
@@ -71,6 +107,11 @@ LUNG_VISITED = (60, 180, 90)
 ALIGNMENT_RADIUS = 48
 POINT_R = 10
 
+# Background chrome (skeleton, hands, torso, path, badge rims) is drawn
+# aliased – Wu antialiasing costs several times more per primitive and is
+# barely visible on 1-px lines.  Targets and text keep cv2.LINE_AA.
+CHROME_LINE = cv2.LINE_8
+
 # ─── Shared State ─────────────────────────────────────────────────────────────
 
 class TrackerState:
@@ -80,11 +121,22 @@ class TrackerState:
         self.mode = "heart"
         self.visited = {}
         self.reset_requested = False
+        # Serialised /status body, rebuilt only after visited/mode change
+        self.status_json = None
+        self.status_dirty = True
         self.running = True
         # Latest encoded JPEG frame (bytes) — written by processing thread,
         # read by any number of /feed clients
         self.jpeg_frame = None
-        self.frame_event = threading.Event()   # signalled on every new frame
+        self.frame_id = 0                       # bumped on every new frame
+        self.frame_cond = threading.Condition()
+
+    def publish_frame(self, jpeg):
+        """Store a new JPEG and wake every waiting /feed client."""
+        with self.frame_cond:
+            self.jpeg_frame = jpeg
+            self.frame_id += 1
+            self.frame_cond.notify_all()
 
 state = TrackerState()
 
@@ -97,6 +149,31 @@ def ensure_model(path, url):
         print("[INFO] Done.")
 
 
+JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, STREAM_QUALITY,
+               cv2.IMWRITE_JPEG_OPTIMIZE, 0,
+               cv2.IMWRITE_JPEG_PROGRESSIVE, 0]
+if hasattr(cv2, "IMWRITE_JPEG_SAMPLING_FACTOR"):     # OpenCV >= 4.5.5
+    JPEG_PARAMS += [cv2.IMWRITE_JPEG_SAMPLING_FACTOR,
+                    cv2.IMWRITE_JPEG_SAMPLING_FACTOR_420]
+
+
+def dumps_json(obj):
+    """Compact, key-sorted JSON bytes (same layout as Flask's jsonify)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode()
+
+
+def encode_jpeg(frame):
+    """Encode a BGR frame for the MJPEG stream; returns the JPEG bytes."""
+    if simplejpeg is not None:
+        return simplejpeg.encode_jpeg(np.ascontiguousarray(frame),
+                                      quality=STREAM_QUALITY, colorspace='BGR',
+                                      colorsubsampling='420', fastdct=True)
+    _, buf = cv2.imencode('.jpg', frame, JPEG_PARAMS)
+    return buf.tobytes()
+
+
 def px(lm, w, h):
     return int(lm.x * w), int(lm.y * h)
 
@@ -106,16 +183,31 @@ def dist(a, b):
 
 
 def rounded_rect(img, pt1, pt2, colour, radius=12, thickness=-1, alpha=0.75):
-    overlay = img.copy()
-    x1, y1 = pt1
-    x2, y2 = pt2
+    # Only the shape's bounding box is copied and blended (padded in case
+    # the corner arcs overhang a rect smaller than 2 * radius)
+    pad = radius + max(thickness, 0)
+    ih, iw = img.shape[:2]
+    bx1, by1 = max(pt1[0] - pad, 0), max(pt1[1] - pad, 0)
+    bx2, by2 = min(pt2[0] + pad + 1, iw), min(pt2[1] + pad + 1, ih)
+    if bx1 >= bx2 or by1 >= by2:
+        return
+    roi = img[by1:by2, bx1:bx2]
+    overlay = roi.copy()
+    x1, y1 = pt1[0] - bx1, pt1[1] - by1
+    x2, y2 = pt2[0] - bx1, pt2[1] - by1
     cv2.rectangle(overlay, (x1 + radius, y1), (x2 - radius, y2), colour, thickness)
     cv2.rectangle(overlay, (x1, y1 + radius), (x2, y2 - radius), colour, thickness)
     cv2.ellipse(overlay, (x1 + radius, y1 + radius), (radius, radius), 180, 0, 90, colour, thickness)
     cv2.ellipse(overlay, (x2 - radius, y1 + radius), (radius, radius), 270, 0, 90, colour, thickness)
     cv2.ellipse(overlay, (x1 + radius, y2 - radius), (radius, radius),  90, 0, 90, colour, thickness)
     cv2.ellipse(overlay, (x2 - radius, y2 - radius), (radius, radius),   0, 0, 90, colour, thickness)
-    cv2.addWeighted(overlay, alpha, img, 1 - alpha, 0, img)
+    cv2.addWeighted(overlay, alpha, roi, 1 - alpha, 0, roi)
+
+
+@functools.lru_cache(maxsize=None)
+def text_size(text, scale, thickness=1):
+    """cv2.getTextSize for the Hershey font, memoised – the labels never change."""
+    return cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)[0]
 
 
 # ─── Anatomy ──────────────────────────────────────────────────────────────────
@@ -128,47 +220,39 @@ def get_body_anchors(plm, w, h):
     return ls, rs, lh, rh
 
 
-def compute_cardiac_points(plm, w, h):
-    ls, rs, lh, rh = get_body_anchors(plm, w, h)
+# Auscultation sites as fractions of shoulder width (x, from the midline)
+# and torso height (y, from the shoulder line), listed in exam order.
+CARDIAC_NAMES = ("Aortic", "Pulmonic", "Erb's Pt", "Tricuspid", "Mitral")
+CARDIAC_XFRAC = np.array([-0.11, 0.11, 0.11, 0.11, 0.32])
+CARDIAC_YFRAC = np.array([0.12, 0.12, 0.21, 0.30, 0.39])
+
+LUNG_NAMES = ("R Apex", "L Apex", "R Upper", "L Upper", "R Middle", "R Lower", "L Lower")
+LUNG_XFRAC = np.array([-0.32, 0.32, -0.32, 0.32, -0.32, -0.32, 0.32])
+LUNG_YFRAC = np.array([0.03, 0.03, 0.14, 0.14, 0.32, 0.50, 0.50])
+
+
+def place_points(anchors, names, xfrac, yfrac):
+    """Scale one offset table onto the torso in a single vectorised step."""
+    ls, rs, lh, rh = anchors
     torso_h = int(((lh[1] - ls[1]) + (rh[1] - rs[1])) / 2)
     mid_x = (ls[0] + rs[0]) // 2
     top_y = (ls[1] + rs[1]) // 2
     shoulder_w = abs(rs[0] - ls[0])
-    stb = int(shoulder_w * 0.11)
-    mcl = int(shoulder_w * 0.32)
-
-    ics2 = int(torso_h * 0.12)
-    ics3 = int(torso_h * 0.21)
-    ics4 = int(torso_h * 0.30)
-    ics5 = int(torso_h * 0.39)
-
-    points = [
-        {"name": "Aortic",    "pos": (mid_x - stb, top_y + ics2), "order": 1},
-        {"name": "Pulmonic",  "pos": (mid_x + stb, top_y + ics2), "order": 2},
-        {"name": "Erb's Pt",  "pos": (mid_x + stb, top_y + ics3), "order": 3},
-        {"name": "Tricuspid", "pos": (mid_x + stb, top_y + ics4), "order": 4},
-        {"name": "Mitral",    "pos": (mid_x + mcl, top_y + ics5), "order": 5},
-    ]
-    return points, (ls, rs, lh, rh)
+
+    xs = mid_x + (shoulder_w * xfrac).astype(np.int32)
+    ys = top_y + (torso_h * yfrac).astype(np.int32)
+    return [{"name": name, "pos": pos, "order": order}
+            for order, (name, pos) in enumerate(zip(names, zip(xs.tolist(), ys.tolist())), 1)]
+
+
+def compute_cardiac_points(plm, w, h):
+    anchors = get_body_anchors(plm, w, h)
+    return place_points(anchors, CARDIAC_NAMES, CARDIAC_XFRAC, CARDIAC_YFRAC), anchors
 
 
 def compute_lung_points(plm, w, h):
-    ls, rs, lh, rh = get_body_anchors(plm, w, h)
-    torso_h = int(((lh[1] - ls[1]) + (rh[1] - rs[1])) / 2)
-    mid_x = (ls[0] + rs[0]) // 2
-    top_y = (ls[1] + rs[1]) // 2
-    mcl = int(abs(rs[0] - ls[0]) * 0.32)
-
-    points = [
-        {"name": "R Apex",   "pos": (mid_x - mcl, top_y + int(torso_h * 0.03)), "order": 1},
-        {"name": "L Apex",   "pos": (mid_x + mcl, top_y + int(torso_h * 0.03)), "order": 2},
-        {"name": "R Upper",  "pos": (mid_x - mcl, top_y + int(torso_h * 0.14)), "order": 3},
-        {"name": "L Upper",  "pos": (mid_x + mcl, top_y + int(torso_h * 0.14)), "order": 4},
-        {"name": "R Middle", "pos": (mid_x - mcl, top_y + int(torso_h * 0.32)), "order": 5},
-        {"name": "R Lower",  "pos": (mid_x - mcl, top_y + int(torso_h * 0.50)), "order": 6},
-        {"name": "L Lower",  "pos": (mid_x + mcl, top_y + int(torso_h * 0.50)), "order": 7},
-    ]
-    return points, (ls, rs, lh, rh)
+    anchors = get_body_anchors(plm, w, h)
+    return place_points(anchors, LUNG_NAMES, LUNG_XFRAC, LUNG_YFRAC), anchors
 
 
 # ─── Drawing (optimized: no glow, simpler overlays) ─────────────────────────
@@ -179,9 +263,9 @@ def draw_skeleton(frame, plm, w, h):
         (11,23),(12,24),(23,24),(23,25),(24,26),(25,27),(26,28),
     ]
     for a, b in CONNS:
-        cv2.line(frame, px(plm[a], w, h), px(plm[b], w, h), SKELETON_COL, 1, cv2.LINE_AA)
+        cv2.line(frame, px(plm[a], w, h), px(plm[b], w, h), SKELETON_COL, 1, CHROME_LINE)
     for i in [11,12,13,14,15,16,23,24,25,26,27,28]:
-        cv2.circle(frame, px(plm[i], w, h), 3, SKELETON_COL, -1, cv2.LINE_AA)
+        cv2.circle(frame, px(plm[i], w, h), 3, SKELETON_COL, -1, CHROME_LINE)
 
 
 def draw_hand(frame, hlm, w, h):
@@ -191,28 +275,43 @@ def draw_hand(frame, hlm, w, h):
         (13,17),(17,18),(18,19),(19,20),(0,17),
     ]
     for a, b in CONNS:
-        cv2.line(frame, px(hlm[a], w, h), px(hlm[b], w, h), HAND_COL, 1, cv2.LINE_AA)
+        cv2.line(frame, px(hlm[a], w, h), px(hlm[b], w, h), HAND_COL, 1, CHROME_LINE)
     for i in range(21):
-        cv2.circle(frame, px(hlm[i], w, h), 2, (230, 190, 70), -1, cv2.LINE_AA)
+        cv2.circle(frame, px(hlm[i], w, h), 2, (230, 190, 70), -1, CHROME_LINE)
 
 
 def draw_torso_zone(frame, anchors):
     ls, rs, lh, rh = anchors
     pts = np.array([rs, ls, lh, rh], dtype=np.int32)
-    overlay = frame.copy()
-    cv2.fillPoly(overlay, [pts], (35, 25, 30))
-    cv2.addWeighted(overlay, 0.15, frame, 0.85, 0, frame)
-    cv2.polylines(frame, [pts], True, (65, 55, 55), 1, cv2.LINE_AA)
+
+    # Blend only the torso's bounding box, not the whole frame
+    h, w = frame.shape[:2]
+    x0, y0 = np.maximum(pts.min(axis=0), 0).tolist()
+    x1, y1 = np.minimum(pts.max(axis=0) + 1, (w, h)).tolist()
+    if x0 < x1 and y0 < y1:
+        roi = frame[y0:y1, x0:x1]
+        overlay = roi.copy()
+        cv2.fillPoly(overlay, [pts], (35, 25, 30), offset=(-x0, -y0))
+        cv2.addWeighted(overlay, 0.15, roi, 0.85, 0, roi)
+    cv2.polylines(frame, [pts], True, (65, 55, 55), 1, CHROME_LINE)
 
     mid_x = (ls[0] + rs[0]) // 2
     top_y = min(ls[1], rs[1])
     bot_y = max(lh[1], rh[1])
+    # Dashed sternum, every dash in one polylines call
     seg = 8
-    for y in range(top_y, bot_y, seg * 2):
-        cv2.line(frame, (mid_x, y), (mid_x, min(y + seg, bot_y)), (50, 40, 40), 1, cv2.LINE_AA)
-
-
-def draw_target_point(frame, t, aligned, visited_flag, is_heart, t_now, order_active):
+    ys = np.arange(top_y, bot_y, seg * 2, dtype=np.int32)
+    if len(ys):
+        dashes = np.empty((len(ys), 2, 2), np.int32)
+        dashes[:, :, 0] = mid_x
+        dashes[:, 0, 1] = ys
+        dashes[:, 1, 1] = np.minimum(ys + seg, bot_y)
+        cv2.polylines(frame, dashes, False, (50, 40, 40), 1, CHROME_LINE)
+
+
+def draw_target_point(frame, t, aligned, visited_flag, is_heart, pulse_fast, breath,
+                      order_active):
+    """`pulse_fast` and `breath` are the frame's |sin| animation phases."""
     pos = t["pos"]
     cx, cy = pos
     order = t.get("order", 0)
@@ -220,7 +319,7 @@ def draw_target_point(frame, t, aligned, visited_flag, is_heart, t_now, order_ac
     if aligned:
         col = GREEN_OK if is_heart else LUNG_ACTIVE
         r = POINT_R + 3
-        pulse = int(4 * abs(math.sin(t_now * 4)))
+        pulse = int(4 * pulse_fast)
         cv2.circle(frame, pos, r + 4 + pulse, col, 2, cv2.LINE_AA)
     elif visited_flag:
         col = GREEN_DIM if is_heart else LUNG_VISITED
@@ -232,16 +331,16 @@ def draw_target_point(frame, t, aligned, visited_flag, is_heart, t_now, order_ac
             col = LUNG_DEFAULT
         r = POINT_R
         if order == order_active:
-            breath = int(3 * abs(math.sin(t_now * 2)))
+            grow = int(3 * breath)
             check_col = CARDIAC_RED if is_heart else LUNG_DEFAULT
-            cv2.circle(frame, pos, r + breath + 6, check_col, 1, cv2.LINE_AA)
+            cv2.circle(frame, pos, r + grow + 6, check_col, 1, cv2.LINE_AA)
 
     cv2.circle(frame, pos, r, col, -1, cv2.LINE_AA)
     cv2.circle(frame, pos, r + 1, WHITE, 1, cv2.LINE_AA)
 
     if is_heart:
         num_str = str(order)
-        (tw, th), _ = cv2.getTextSize(num_str, cv2.FONT_HERSHEY_SIMPLEX, 0.35, 1)
+        tw, th = text_size(num_str, 0.35)
         cv2.putText(frame, num_str, (cx - tw // 2, cy + th // 2),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.35, WHITE, 1, cv2.LINE_AA)
 
@@ -251,7 +350,7 @@ def draw_target_point(frame, t, aligned, visited_flag, is_heart, t_now, order_ac
     cv2.line(frame, (cx, cy + r), (cx, cy + r + 4), DIM_WHITE, 1, cv2.LINE_AA)
 
     label = t["name"]
-    (lw, lh_), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.34, 1)
+    lw, lh_ = text_size(label, 0.34)
     lx = cx - lw // 2
     ly = cy - r - 12
     rounded_rect(frame, (lx - 4, ly - lh_ - 2), (lx + lw + 4, ly + 3), BG_PANEL, radius=4, alpha=0.70)
@@ -260,30 +359,40 @@ def draw_target_point(frame, t, aligned, visited_flag, is_heart, t_now, order_ac
 
 def draw_connection_lines(frame, targets):
     ordered = sorted(targets, key=lambda t: t["order"])
+    seg = 6
+    dashes = []
     for i in range(len(ordered) - 1):
-        p1, p2 = ordered[i]["pos"], ordered[i + 1]["pos"]
+        p1 = np.array(ordered[i]["pos"], dtype=np.float64)
+        p2 = np.array(ordered[i + 1]["pos"], dtype=np.float64)
         length = dist(p1, p2)
         if length < 1:
             continue
-        seg = 6
-        dx, dy = (p2[0] - p1[0]) / length, (p2[1] - p1[1]) / length
-        d = 0
-        while d < length:
-            s = d
-            e = min(d + seg, length)
-            sp = (int(p1[0] + dx * s), int(p1[1] + dy * s))
-            ep = (int(p1[0] + dx * e), int(p1[1] + dy * e))
-            cv2.line(frame, sp, ep, (50, 40, 40), 1, cv2.LINE_AA)
-            d += seg * 2
+        # Every dash of every pair goes out in one polylines call
+        step = (p2 - p1) / length
+        s = np.arange(0, length, seg * 2)
+        e = np.minimum(s + seg, length)
+        dashes.append(np.stack([p1 + step * s[:, None],
+                                p1 + step * e[:, None]], axis=1))
+    if dashes:
+        cv2.polylines(frame, np.concatenate(dashes).astype(np.int32), False,
+                      (50, 40, 40), 1, CHROME_LINE)
 
 
-def draw_hud(frame, visited, targets, is_heart, fps, w, h, t_now):
-    panel_w = 200
-    panel_h = 55 + len(targets) * 26 + 40
-    px1 = w - panel_w - 10
-    py1 = 42
-    px2 = w - 10
-    py2 = py1 + panel_h
+HUD_W = 200      # panel width; the panel sits 10 px in from the right edge
+HUD_TOP = 42
+
+
+def hud_height(n_points):
+    return 55 + n_points * 26 + 40
+
+
+def render_hud(frame, checklist, is_heart):
+    """Paint the HUD panel with its top-left corner at (0, 0).
+
+    `checklist` is a tuple of (order, name, ok) rows in exam order.
+    """
+    px1, py1 = 0, 0
+    px2, py2 = HUD_W, hud_height(len(checklist))
     rounded_rect(frame, (px1, py1), (px2, py2), BG_PANEL, radius=10, alpha=0.82)
 
     title = "CARDIAC EXAM" if is_heart else "LUNG FIELDS"
@@ -291,21 +400,19 @@ def draw_hud(frame, visited, targets, is_heart, fps, w, h, t_now):
     cv2.putText(frame, title, (px1 + 12, py1 + 20), cv2.FONT_HERSHEY_SIMPLEX, 0.42, title_col, 1, cv2.LINE_AA)
     cv2.line(frame, (px1 + 10, py1 + 28), (px2 - 10, py1 + 28), (50, 40, 45), 1, cv2.LINE_AA)
 
-    ordered = sorted(targets, key=lambda t: t["order"])
     y = py1 + 44
-    done_count = sum(1 for t in ordered if visited.get(t["name"], False))
+    done_count = sum(1 for _, _, ok in checklist if ok)
 
-    for t in ordered:
-        ok = visited.get(t["name"], False)
+    for order, name, ok in checklist:
         badge_col = GREEN_OK if ok else (60, 50, 55)
         cv2.circle(frame, (px1 + 20, y - 3), 7, badge_col, -1, cv2.LINE_AA)
-        cv2.circle(frame, (px1 + 20, y - 3), 7, (80, 70, 70), 1, cv2.LINE_AA)
-        num = str(t["order"])
-        (nw, nh), _ = cv2.getTextSize(num, cv2.FONT_HERSHEY_SIMPLEX, 0.28, 1)
+        cv2.circle(frame, (px1 + 20, y - 3), 7, (80, 70, 70), 1, CHROME_LINE)
+        num = str(order)
+        nw, nh = text_size(num, 0.28)
         cv2.putText(frame, num, (px1 + 20 - nw // 2, y - 3 + nh // 2), cv2.FONT_HERSHEY_SIMPLEX, 0.28, WHITE, 1, cv2.LINE_AA)
 
         tcol = GREEN_OK if ok else DIM_WHITE
-        cv2.putText(frame, t["name"], (px1 + 34, y), cv2.FONT_HERSHEY_SIMPLEX, 0.32, tcol, 1, cv2.LINE_AA)
+        cv2.putText(frame, name, (px1 + 34, y), cv2.FONT_HERSHEY_SIMPLEX, 0.32, tcol, 1, cv2.LINE_AA)
         if ok:
             cv2.putText(frame, "OK", (px2 - 30, y), cv2.FONT_HERSHEY_SIMPLEX, 0.26, GREEN_OK, 1, cv2.LINE_AA)
         y += 26
@@ -314,7 +421,7 @@ def draw_hud(frame, visited, targets, is_heart, fps, w, h, t_now):
     bar_x1 = px1 + 10
     bar_x2 = px2 - 10
     bar_w = bar_x2 - bar_x1
-    progress = done_count / max(len(targets), 1)
+    progress = done_count / max(len(checklist), 1)
     fill_w = int(bar_w * progress)
     bar_col = CARDIAC_RED if is_heart else ACCENT_GREEN
 
@@ -326,22 +433,51 @@ def draw_hud(frame, visited, targets, is_heart, fps, w, h, t_now):
     cv2.putText(frame, pct, (bar_x2 + 4, bar_y + 7), cv2.FONT_HERSHEY_SIMPLEX, 0.24, DIM_WHITE, 1, cv2.LINE_AA)
 
 
-def draw_top_bar(frame, w, fps, is_heart, mode_name):
-    overlay = frame.copy()
-    cv2.rectangle(overlay, (0, 0), (w, 32), BG_PANEL, -1)
-    cv2.addWeighted(overlay, 0.75, frame, 0.25, 0, frame)
+@functools.lru_cache(maxsize=64)
+def hud_sprite(checklist, is_heart):
+    """Whole HUD for one checklist state; re-rendered only when it changes.
+
+    The sprite runs on to the frame's right edge so the percentage text
+    beyond the panel is clipped exactly as before.
+    """
+    size = (HUD_W + 11, hud_height(len(checklist)) + 1)
+    return bake_bgra(size, lambda img: render_hud(img, checklist, is_heart))
+
+
+def draw_hud(frame, visited, targets, is_heart, fps, w, h, t_now):
+    ordered = sorted(targets, key=lambda t: t["order"])
+    checklist = tuple((t["order"], t["name"], visited.get(t["name"], False))
+                      for t in ordered)
+    blit_bgra(frame, hud_sprite(checklist, is_heart), (w - HUD_W - 10, HUD_TOP))
+
+
+def render_top_bar(frame, w, is_heart):
+    """Static part of the top bar: background and title."""
+    bar = frame[0:33, :w + 1]
+    cv2.addWeighted(np.full_like(bar, BG_PANEL), 0.75, bar, 0.25, 0, bar)
 
     title_col = GOLD if is_heart else ACCENT_CYAN
     title = "HEART PLACEMENT TRACKER" if is_heart else "LUNG PLACEMENT TRACKER"
     cv2.putText(frame, title, (10, 22), cv2.FONT_HERSHEY_SIMPLEX, 0.42, title_col, 1, cv2.LINE_AA)
+
+
+@functools.lru_cache(maxsize=8)
+def top_bar_sprite(w, is_heart):
+    return bake_bgra((w, 33), lambda img: render_top_bar(img, w, is_heart))
+
+
+def draw_top_bar(frame, w, fps, is_heart, mode_name):
+    blit_bgra(frame, top_bar_sprite(w, is_heart), (0, 0))
+
+    # FPS is the only part that changes from frame to frame
     cv2.putText(frame, f"FPS {int(fps)}", (w - 70, 22), cv2.FONT_HERSHEY_SIMPLEX, 0.30, DIM_WHITE, 1, cv2.LINE_AA)
 
 
 def draw_bottom_bar(frame, w, h, all_done, is_heart, t_now):
     bar_h = 32
-    overlay = frame.copy()
-    cv2.rectangle(overlay, (0, h - bar_h), (w, h), BG_PANEL, -1)
-    cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
+    # Blend just the strip the bar covers, not the whole frame
+    bar = frame[h - bar_h:h, :w + 1]
+    cv2.addWeighted(np.full_like(bar, BG_PANEL), 0.7, bar, 0.3, 0, bar)
 
     if all_done:
         label = "ALL CARDIAC POINTS CHECKED" if is_heart else "ALL LUNG POINTS CHECKED"
@@ -358,6 +494,42 @@ def draw_bottom_bar(frame, w, h, all_done, is_heart, t_now):
 #  encodes to JPEG, and stores the result in state.jpeg_frame.
 #  The /feed endpoint just reads the latest JPEG — no per-request camera.
 #
+#  MediaPipe runs on its own worker so capture, drawing and encoding never
+#  wait for inference:
+#
+#    processing_loop ──infer_q (1 slot)──▶ inference_worker ──▶ LatestResults
+#          ▲                                                        │
+#          └──────────── newest landmarks, read every frame ────────┘
+#
+
+class LatestResults:
+    """Newest pose/hand results, written by the inference worker."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pose = None
+        self.hand = None
+
+    def set(self, pose, hand):
+        with self.lock:
+            self.pose = pose
+            self.hand = hand
+
+    def get(self):
+        with self.lock:
+            return self.pose, self.hand
+
+
+def inference_worker(pose_lm, hand_lm, infer_q, results):
+    """Run both landmarkers on queued (rgb, timestamp) pairs until None."""
+    while True:
+        item = infer_q.get()
+        if item is None:
+            return
+        rgb, ts = item
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+        results.set(pose_lm.detect_for_video(mp_image, ts),
+                    hand_lm.detect_for_video(mp_image, ts))
+
 
 def processing_loop():
     """Persistent background loop — captures, processes, and encodes frames."""
@@ -366,8 +538,15 @@ def processing_loop():
 
     BaseOptions = mp_python.BaseOptions
 
+    delegate = pick_delegate(POSE_MODEL)
+    pose_model = POSE_MODEL
+    if delegate == BaseOptions.Delegate.GPU:
+        ensure_model(POSE_MODEL_FULL, POSE_URL_FULL)
+        pose_model = POSE_MODEL_FULL
+
     pose_opts = vision.PoseLandmarkerOptions(
-        base_options=BaseOptions(model_asset_path=POSE_MODEL),
+        base_options=BaseOptions(model_asset_path=pose_model,
+                                 delegate=delegate),
         running_mode=vision.RunningMode.VIDEO,
         num_poses=1,
         min_pose_detection_confidence=0.5,
@@ -375,7 +554,8 @@ def processing_loop():
         min_tracking_confidence=0.5,
     )
     hand_opts = vision.HandLandmarkerOptions(
-        base_options=BaseOptions(model_asset_path=HAND_MODEL),
+        base_options=BaseOptions(model_asset_path=HAND_MODEL,
+                                 delegate=delegate),
         running_mode=vision.RunningMode.VIDEO,
         num_hands=2,
         min_hand_detection_confidence=0.5,
@@ -388,52 +568,74 @@ def processing_loop():
         print("[ERROR] Cannot open webcam.")
         return
 
+    # MJPG keeps most UVC webcams at full rate and decodes faster than YUYV
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, STREAM_W)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, STREAM_H)
+    cap.set(cv2.CAP_PROP_FPS, CAMERA_FPS)
     cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
 
-    prev_time = time.time()
-    last_pose_res = None
-    last_hand_res = None
+    prev_time = last_read = time.time()
+    latest = LatestResults()
+    infer_q = queue.Queue(maxsize=1)
+
+    # Persistent pre-processing buffers – nothing is allocated per frame
+    flip_buf = np.empty((STREAM_H, STREAM_W, 3), np.uint8)
+    small_buf = np.empty((DETECT_H, DETECT_W, 3), np.uint8)
+    # Two RGB buffers, alternated: a new one is only written while the queue
+    # is empty, i.e. when the worker holds at most the other one
+    rgb_bufs = (np.empty_like(small_buf), np.empty_like(small_buf))
+    rgb_next = 0
 
     print("[INFO] Processing loop started — camera is live.")
 
     with vision.PoseLandmarker.create_from_options(pose_opts) as pose_lm, \
          vision.HandLandmarker.create_from_options(hand_opts) as hand_lm:
 
+        worker = threading.Thread(target=inference_worker,
+                                  args=(pose_lm, hand_lm, infer_q, latest),
+                                  daemon=True)
+        worker.start()
         frame_idx = 0
 
         while state.running:
+            # If the last iteration overran, the driver is still holding
+            # frames from back then; skip past (at most two of) them so the
+            # stream doesn't build up latency
+            behind = int((time.time() - last_read) * CAMERA_FPS) - 1
+            for _ in range(min(behind, 2)):
+                cap.grab()
+
             ret, frame = cap.read()
+            last_read = time.time()
             if not ret:
-                time.sleep(0.01)
+                time.sleep(0.002)
                 continue
 
-            frame = cv2.flip(frame, 1)
+            # Reallocates (once) if the camera ignored the requested size
+            frame = flip_buf = cv2.flip(frame, 1, dst=flip_buf)
             h, w, _ = frame.shape
             frame_idx += 1
 
-            # Detect every 2nd frame for speed
-            if frame_idx % 2 == 0:
-                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+            # Hand every 2nd frame to the worker, unless it is still busy
+            # (only this thread puts, so a free slot cannot fill up meanwhile)
+            if frame_idx % 2 == 0 and not infer_q.full():
+                cv2.resize(frame, (DETECT_W, DETECT_H), dst=small_buf,
+                           interpolation=cv2.INTER_AREA)
+                rgb = rgb_bufs[rgb_next]
+                rgb_next ^= 1
+                cv2.cvtColor(small_buf, cv2.COLOR_BGR2RGB, dst=rgb)
                 ts = int(frame_idx * (1000 / 30))
-                last_pose_res = pose_lm.detect_for_video(mp_image, ts)
-                last_hand_res = hand_lm.detect_for_video(mp_image, ts)
+                infer_q.put_nowait((rgb, ts))
 
-            pose_res = last_pose_res
-            hand_res = last_hand_res
+            pose_res, hand_res = latest.get()
             t_now = time.time()
 
             if pose_res is None:
                 # Still initializing
                 cv2.putText(frame, "Initializing...", (w // 2 - 70, h // 2),
                             cv2.FONT_HERSHEY_SIMPLEX, 0.6, DIM_WHITE, 1, cv2.LINE_AA)
-                _, buf = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 65])
-                with state.lock:
-                    state.jpeg_frame = buf.tobytes()
-                state.frame_event.set()
-                state.frame_event.clear()
+                state.publish_frame(encode_jpeg(frame))
                 continue
 
             with state.lock:
@@ -441,6 +643,7 @@ def processing_loop():
                 if state.reset_requested:
                     state.visited = {}
                     state.reset_requested = False
+                    state.status_dirty = True
                 visited = dict(state.visited)
 
             is_heart = current_mode == "heart"
@@ -478,26 +681,38 @@ def processing_loop():
                         hc = px(hlm[9], w, h)
                         hand_positions.append(hc)
 
-                for t in targets:
-                    aligned = False
-                    for hp in hand_positions:
-                        if dist(hp, t["pos"]) < ALIGNMENT_RADIUS:
-                            aligned = True
-                            visited[t["name"]] = True
-                            break
+                # Squared target-to-hand distances for all pairs at once
+                tgt_arr = np.array([t["pos"] for t in targets], dtype=np.int32)
+                if hand_positions:
+                    hand_arr = np.array(hand_positions, dtype=np.int32)
+                    d2 = ((tgt_arr[:, None, :] - hand_arr[None, :, :]) ** 2).sum(-1)
+                    in_reach = d2 < ALIGNMENT_RADIUS * ALIGNMENT_RADIUS
+                else:
+                    in_reach = np.zeros((len(targets), 1), dtype=bool)
+                aligned_any = in_reach.any(1)
+                first_hand = in_reach.argmax(1)
+
+                # Animation phases, evaluated once per frame for all targets
+                pulse_fast = abs(math.sin(t_now * 4))
+                breath = abs(math.sin(t_now * 2))
+
+                for i, t in enumerate(targets):
+                    aligned = bool(aligned_any[i])
+                    if aligned:
+                        visited[t["name"]] = True
 
                     draw_target_point(frame, t, aligned, visited.get(t["name"], False),
-                                      is_heart, t_now, order_active)
+                                      is_heart, pulse_fast, breath, order_active)
 
                     if aligned:
-                        for hp in hand_positions:
-                            if dist(hp, t["pos"]) < ALIGNMENT_RADIUS:
-                                line_col = GREEN_OK if is_heart else LUNG_ACTIVE
-                                cv2.line(frame, hp, t["pos"], line_col, 2, cv2.LINE_AA)
-                                break
+                        hp = hand_positions[first_hand[i]]
+                        line_col = GREEN_OK if is_heart else LUNG_ACTIVE
+                        cv2.line(frame, hp, t["pos"], line_col, 2, cv2.LINE_AA)
 
                 with state.lock:
-                    state.visited = dict(visited)
+                    if visited != state.visited:
+                        state.visited = dict(visited)
+                        state.status_dirty = True
 
                 curr_time = time.time()
                 fps = 1.0 / (curr_time - prev_time + 1e-9)
@@ -522,11 +737,11 @@ def processing_loop():
                 draw_top_bar(frame, w, fps, is_heart, current_mode)
 
             # Encode and store in shared buffer
-            _, buf = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 65])
-            with state.lock:
-                state.jpeg_frame = buf.tobytes()
-            state.frame_event.set()
-            state.frame_event.clear()
+            state.publish_frame(encode_jpeg(frame))
+
+        # Let the worker finish before the landmarkers are closed
+        infer_q.put(None)
+        worker.join()
 
     cap.release()
     print("[INFO] Processing loop stopped — camera released.")
@@ -534,18 +749,29 @@ def processing_loop():
 
 # ─── Feed Generator (reads from shared buffer) ───────────────────────────────
 
+# Multipart framing around each JPEG, yielded as separate pieces so the
+# (possibly large) JPEG bytes are never copied into a per-client buffer
+MJPEG_PART_HEAD = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+MJPEG_PART_TAIL = b'\r\n'
+
+
 def stream_feed():
     """Yields MJPEG frames from the shared buffer. Multiple clients can connect
        and disconnect without affecting the camera or processing loop."""
+    last = 0
     while True:
-        # Wait for a new frame (up to 1 second, then check again)
-        state.frame_event.wait(timeout=1.0)
-        with state.lock:
+        # Wait for a frame newer than the last one sent (up to 1 second; on
+        # timeout the current frame is re-sent, which also detects clients
+        # that went away while the camera was stalled)
+        with state.frame_cond:
+            state.frame_cond.wait_for(lambda: state.frame_id != last, timeout=1.0)
             jpeg = state.jpeg_frame
+            last = state.frame_id
         if jpeg is None:
             continue
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n')
+        yield MJPEG_PART_HEAD
+        yield jpeg
+        yield MJPEG_PART_TAIL
 
 
 # ─── Flask App ────────────────────────────────────────────────────────────────
@@ -567,6 +793,7 @@ def feed():
         if state.mode != mode:
             state.mode = mode
             state.visited = {}
+            state.status_dirty = True
 
     return Response(
         stream_feed(),
@@ -576,15 +803,23 @@ def feed():
 
 @app.route('/status')
 def tracker_status():
+    # The dashboard polls this; the body is only re-serialised after the
+    # processing loop or /feed changed visited or mode
     with state.lock:
-        visited = dict(state.visited)
-        mode = state.mode
+        if state.status_dirty:
+            state.status_json = build_status_json(state.mode, state.visited)
+            state.status_dirty = False
+        body = state.status_json
+
+    return Response(body, mimetype='application/json')
+
 
+def build_status_json(mode, visited):
     total = len(visited) if visited else 0
     done = sum(1 for v in visited.values() if v)
     progress = (done / total * 100) if total > 0 else 0
 
-    return jsonify({
+    return dumps_json({
         "mode": mode,
         "visited": visited,
         "total": total,